@@ -0,0 +1,113 @@
+"""Binary bus capture for Kocom Wallpad integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import struct
+import time
+from collections.abc import Iterator
+
+from .const import CAPTURE_MAX_BYTES, CAPTURE_BACKUP_COUNT, CAPTURE_MAX_PENDING
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"KOCOMCAP"
+
+# 기록 종류
+CAPTURE_RX_FRAME = 0
+CAPTURE_TX_FRAME = 1
+CAPTURE_RX_CHUNK = 2
+
+# 기록 형식: timestamp(double) | kind(byte) | length(ushort) | data
+RECORD_HEADER = struct.Struct("<dBH")
+
+
+def read_capture(path: str) -> Iterator[tuple[float, int, bytes]]:
+    """Read (timestamp, kind, data) records from a capture file."""
+    with open(path, "rb") as file:
+        if file.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"Not a Kocom capture file: {path}")
+        while header := file.read(RECORD_HEADER.size):
+            if len(header) < RECORD_HEADER.size:
+                break
+            timestamp, kind, length = RECORD_HEADER.unpack(header)
+            data = file.read(length)
+            if len(data) < length:
+                break
+            yield timestamp, kind, data
+
+
+class BusCapture:
+    """Write timestamped bus data to a size-bounded rotating file."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = CAPTURE_MAX_BYTES,
+        backup_count: int = CAPTURE_BACKUP_COUNT,
+        max_pending: int = CAPTURE_MAX_PENDING,
+    ) -> None:
+        """Initialize."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending: list[bytes] = []
+        self._size: int | None = None
+        self._task: asyncio.Task | None = None
+
+    def record(self, kind: int, data: bytes) -> None:
+        """Queue a record; the file is written in the executor."""
+        if len(self._pending) >= self.max_pending:
+            # 디스크가 따라오지 못하면 메모리를 늘리지 않고 버림
+            self.dropped += 1
+            return
+
+        self._pending.append(RECORD_HEADER.pack(time.time(), kind, len(data)) + data)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush())
+
+    async def _flush(self) -> None:
+        """Write queued records until the queue is empty."""
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            records, self._pending = self._pending, []
+            try:
+                await loop.run_in_executor(None, self._write, b"".join(records))
+            except OSError as err:
+                _LOGGER.error(f"Capture write error: {err}")
+                self.dropped += len(records)
+
+    def _write(self, blob: bytes) -> None:
+        """Append records to the capture file, rotating it when full."""
+        if self._size is None:
+            self._size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if self._size and self._size + len(blob) > self.max_bytes:
+            self._rotate()
+
+        with open(self.path, "ab") as file:
+            if not self._size:
+                file.write(CAPTURE_MAGIC)
+                self._size = len(CAPTURE_MAGIC)
+            file.write(blob)
+        self._size += len(blob)
+
+    def _rotate(self) -> None:
+        """Shift capture.N files and start a new capture file."""
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._size = 0
+
+    async def async_close(self) -> None:
+        """Write out the remaining records."""
+        if self._task is not None:
+            await self._task
+            self._task = None
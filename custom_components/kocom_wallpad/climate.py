@@ -11,10 +11,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTemperature, ATTR_TEMPERATURE
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import KocomCoordinator
+from .entity import KocomEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,7 +37,7 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class KocomThermostat(CoordinatorEntity, ClimateEntity):
+class KocomThermostat(KocomEntity, ClimateEntity):
     """Representation of a Kocom Thermostat."""
 
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
@@ -107,8 +107,9 @@ class KocomThermostat(CoordinatorEntity, ClimateEntity):
         )
         
         if result:
-            if self._device_key in self.coordinator.data:
-                self.coordinator.data[self._device_key]["set_temp"] = int(temperature)
+            self.coordinator.async_set_optimistic(
+                self._device_key, {"set_temp": int(temperature)}
+            )
             self.async_write_ha_state()
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
@@ -119,6 +120,5 @@ class KocomThermostat(CoordinatorEntity, ClimateEntity):
         )
         
         if result:
-            if self._device_key in self.coordinator.data:
-                self.coordinator.data[self._device_key]["heat_mode"] = mode
+            self.coordinator.async_set_optimistic(self._device_key, {"heat_mode": mode})
             self.async_write_ha_state()
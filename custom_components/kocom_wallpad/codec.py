@@ -0,0 +1,185 @@
+"""Device value codecs for Kocom Wallpad integration."""
+from __future__ import annotations
+
+import struct
+from typing import Any, Callable
+
+from .const import DEFAULT_LIGHT_COUNT, DEFAULT_INIT_TEMP
+from .protocol import (
+    VALUE_SIZE,
+    CODE_LIGHT,
+    CODE_GAS,
+    CODE_THERMO,
+    CODE_ELEVATOR,
+    CODE_FAN,
+)
+
+# device code -> codec class
+CODECS: dict[int, type[DeviceCodec]] = {}
+
+
+def register_codec(device_code: int) -> Callable[[type[DeviceCodec]], type[DeviceCodec]]:
+    """Register a codec class for a device code."""
+
+    def decorator(codec: type[DeviceCodec]) -> type[DeviceCodec]:
+        CODECS[device_code] = codec
+        return codec
+
+    return decorator
+
+
+def create_codec(device_code: int, **options: Any) -> DeviceCodec:
+    """Create the codec for a device code, or a no-op codec if none is registered."""
+    return CODECS.get(device_code, DeviceCodec)(**options)
+
+
+class DeviceCodec:
+    """Decode 8 byte device values and encode command values."""
+
+    # 명령 값이 기기의 새 상태 값과 같은 형식이면 True
+    command_is_state = False
+
+    def __init__(
+        self,
+        light_count: int = DEFAULT_LIGHT_COUNT,
+        init_temp: int = DEFAULT_INIT_TEMP,
+    ) -> None:
+        """Initialize."""
+        self.light_count = light_count
+        self.init_temp = init_temp
+
+    def decode(self, value: bytes) -> dict:
+        """Decode a device value into its state."""
+        return {}
+
+    def encode(self, command: str, value: Any, state: dict) -> bytes | None:
+        """Encode a command value, patching the current state."""
+        return None
+
+    def acknowledges(self, sent: bytes, value: bytes) -> bool:
+        """Return true if an ACK value confirms a sent command value."""
+        # 상태 값을 보내는 기기는 바뀐 상태로 응답해야 명령이 적용된 것
+        return not self.command_is_state or value == sent
+
+
+@register_codec(CODE_THERMO)
+class ThermoCodec(DeviceCodec):
+    """Thermostat codec."""
+
+    command_is_state = True
+
+    # value format: HH MM TT 00 CC 000000
+    # HH: heat mode (11=heat, 01=off)
+    # MM: away mode
+    # TT: set temp
+    # CC: current temp
+    _struct = struct.Struct(">BBBxB3x")
+    _default_value = bytes.fromhex("0100050014000000")
+
+    def decode(self, value: bytes) -> dict:
+        """Decode thermostat value."""
+        mode, _away, set_temp, cur_temp = self._struct.unpack(value)
+        heat = mode == 0x11
+        return {
+            "heat_mode": "heat" if heat else "off",
+            "set_temp": set_temp if heat else self.init_temp,
+            "cur_temp": cur_temp or None,
+            "value": value.hex(),
+        }
+
+    def encode(self, command: str, value: Any, state: dict) -> bytes | None:
+        """Encode thermostat command by patching the current value."""
+        current = state.get("value")
+        new_value = bytearray(
+            bytes.fromhex(current) if current else self._default_value
+        )
+        if command == "heat_mode":
+            # 모드 + 00 + 초기값 온도 + 나머지 유지
+            new_value[0] = 0x11 if value == "heat" else 0x01
+            new_value[1] = 0x00
+            new_value[2] = self.init_temp
+        elif command == "set_temp":
+            # 모드 유지 + 새로운 온도 + 나머지 유지
+            new_value[2] = int(value)
+        return bytes(new_value)
+
+    def acknowledges(self, sent: bytes, value: bytes) -> bool:
+        """Return true if an ACK value confirms a sent command value."""
+        # 현재 온도(CC)는 기기가 측정한 값이라 보낸 값과 다를 수 있음
+        return value[:4] == sent[:4] and value[5:] == sent[5:]
+
+
+@register_codec(CODE_LIGHT)
+class LightCodec(DeviceCodec):
+    """Light codec, one byte per light."""
+
+    command_is_state = True
+
+    def decode(self, value: bytes) -> dict:
+        """Decode light value."""
+        return {
+            f"light_{i}": "on" if value[i - 1] else "off"
+            for i in range(1, self.light_count + 1)
+        }
+
+    def encode(self, command: str, value: Any, state: dict) -> bytes | None:
+        """Encode light changes ({light_id: on}) over the current state."""
+        # 현재 조명 상태를 유지한 채 요청된 조명만 변경
+        new_value = bytearray(VALUE_SIZE)
+        for i in range(1, self.light_count + 1):
+            if state.get(f"light_{i}") == "on":
+                new_value[i - 1] = 0xFF
+        for light_id, on in value.items():
+            new_value[light_id - 1] = 0xFF if on else 0x00
+        return bytes(new_value)
+
+
+@register_codec(CODE_FAN)
+class FanCodec(DeviceCodec):
+    """Fan (ventilation) codec."""
+
+    command_is_state = True
+
+    _struct = struct.Struct(">BxB5x")
+    _presets = {0x40: "Low", 0x80: "Medium", 0xC0: "High"}
+    _speeds = {"Off": 0x00, "Low": 0x40, "Medium": 0x80, "High": 0xC0}
+
+    def decode(self, value: bytes) -> dict:
+        """Decode fan value."""
+        power, speed = self._struct.unpack(value)
+        if power != 0x11:
+            return {"state": "off", "preset": "Off"}
+        return {"state": "on", "preset": self._presets.get(speed, "Off")}
+
+    def encode(self, command: str, value: Any, state: dict) -> bytes | None:
+        """Encode fan preset (Off/Low/Medium/High)."""
+        power = 0x10 if value == "Off" else 0x11
+        return self._struct.pack(power, self._speeds.get(value, 0x80))
+
+
+@register_codec(CODE_GAS)
+class GasCodec(DeviceCodec):
+    """Gas valve codec."""
+
+    def decode(self, value: bytes) -> dict:
+        """Decode gas valve value."""
+        return {"state": "on"}
+
+    def encode(self, command: str, value: Any, state: dict) -> bytes | None:
+        """Encode gas valve command, only closing is supported."""
+        if command == "off":
+            return bytes(VALUE_SIZE)
+        return None
+
+
+@register_codec(CODE_ELEVATOR)
+class ElevatorCodec(DeviceCodec):
+    """Elevator codec."""
+
+    # 층 정보의 위치는 실제 패킷으로 확인되지 않았으므로 상태는 해석하지 않음
+
+    def encode(self, command: str, value: Any, state: dict) -> bytes | None:
+        """Encode elevator call."""
+        if command == "on":
+            return bytes(VALUE_SIZE)
+        return None
@@ -16,11 +16,19 @@ from .const import (
     CONF_INIT_TEMP,
     CONF_INIT_FAN_MODE,
     CONF_ENABLED_DEVICES,
+    CONF_ACK_TIMEOUT,
+    CONF_COMMAND_DEBOUNCE,
+    CONF_WARMUP_TIME,
+    CONF_DEBUG_CAPTURE,
     DEFAULT_SOCKET_PORT,
     DEFAULT_RS485_FLOOR,
     DEFAULT_LIGHT_COUNT,
     DEFAULT_INIT_TEMP,
     DEFAULT_INIT_FAN_MODE,
+    DEFAULT_ACK_TIMEOUT,
+    DEFAULT_COMMAND_DEBOUNCE,
+    DEFAULT_WARMUP_TIME,
+    DEFAULT_DEBUG_CAPTURE,
     FAN_PRESETS,
 )
 
@@ -90,6 +98,16 @@ class KocomConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 "thermo_room7": "room7 난방",
                 "thermo_room8": "room8 난방",
             }),
+            vol.Required(CONF_ACK_TIMEOUT, default=DEFAULT_ACK_TIMEOUT): vol.All(
+                vol.Coerce(float), vol.Range(min=0.1, max=5)
+            ),
+            vol.Required(CONF_COMMAND_DEBOUNCE, default=DEFAULT_COMMAND_DEBOUNCE): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=2)
+            ),
+            vol.Required(CONF_WARMUP_TIME, default=DEFAULT_WARMUP_TIME): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=60)
+            ),
+            vol.Required(CONF_DEBUG_CAPTURE, default=DEFAULT_DEBUG_CAPTURE): bool,
         })
 
         return self.async_show_form(
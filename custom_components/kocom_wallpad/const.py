@@ -10,6 +10,10 @@ CONF_LIGHT_COUNT = "light_count"
 CONF_INIT_TEMP = "init_temp"
 CONF_INIT_FAN_MODE = "init_fan_mode"
 CONF_ENABLED_DEVICES = "enabled_devices"
+CONF_ACK_TIMEOUT = "ack_timeout"
+CONF_COMMAND_DEBOUNCE = "command_debounce"
+CONF_WARMUP_TIME = "warmup_time"
+CONF_DEBUG_CAPTURE = "debug_capture"
 
 # Defaults
 DEFAULT_SOCKET_PORT = 8899
@@ -18,6 +22,74 @@ DEFAULT_LIGHT_COUNT = 2
 DEFAULT_INIT_TEMP = 20
 DEFAULT_INIT_FAN_MODE = "Medium"
 DEFAULT_POLLING_INTERVAL = 300
+DEFAULT_ACK_TIMEOUT = 0.5
+DEFAULT_COMMAND_DEBOUNCE = 0.2
+DEFAULT_WARMUP_TIME = 0
+DEFAULT_DEBUG_CAPTURE = False
+
+# Discovery
+DISCOVERY_TIMEOUT = 5
+DISCOVERY_RETRY_INTERVAL = 30
+DISCOVERY_RETRIES = 3
+
+# Refresh scheduler
+# 기기 종류별로 상태를 믿을 수 있는 시간 (초), None은 조회하지 않음
+STALENESS_BUDGETS = {
+    # 가스 밸브 상태 바이트는 아직 해석하지 않으므로 조회해도 알 수 없음
+    "gas": None,
+    "light": 300,
+    "fan": 300,
+    "thermo": 900,
+    "elevator": None,
+}
+REFRESH_SPACING = 2
+
+# Bus rhythm
+BUS_BURST_GAP = 0.1
+BUS_IDLE_GUARD = 0.05
+BUS_TRANSMIT_WINDOW = 0.1
+BUS_MAX_IDLE_WAIT = 1.0
+BUS_MAX_BURST_LENGTH = 2.0
+BUS_PERIOD_MIN = 0.5
+BUS_PERIOD_MAX = 60
+BUS_RHYTHM_ALPHA = 0.2
+BUS_RHYTHM_MIN_SAMPLES = 3
+BUS_RHYTHM_MAX_JITTER = 0.2
+
+# ACK round-trip estimation
+RTT_ALPHA = 0.125
+RTT_BETA = 0.25
+RTT_K = 4
+RTT_MIN_VARIANCE = 0.01
+RTT_MIN_TIMEOUT = 0.05
+RTT_MAX_TIMEOUT = 3.0
+# 응답 없는 명령 뒤 타임아웃을 늘리는 배수의 상한
+RTT_MAX_BACKOFF = 16
+
+# Storage
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
+# Connection
+CONNECT_TIMEOUT = 10
+RECONNECT_BACKOFF_BASE = 0.5
+RECONNECT_BACKOFF_MAX = 30
+BUS_SILENCE_TIMEOUT = 60
+WATCHDOG_INTERVAL = 5
+COMMAND_CONNECT_WAIT = 1
+KEEPALIVE_IDLE = 10
+KEEPALIVE_INTERVAL = 5
+KEEPALIVE_COUNT = 3
+
+# Metrics
+METRICS_RATE_WINDOW = 60
+METRICS_SCAN_INTERVAL = 30
+LOOP_LAG_INTERVAL = 1
+
+# Debug capture
+CAPTURE_MAX_BYTES = 1024 * 1024
+CAPTURE_BACKUP_COUNT = 3
+CAPTURE_MAX_PENDING = 5000
 
 # Protocol Constants
 HEADER = "aa55"
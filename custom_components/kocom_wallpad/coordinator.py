@@ -1,14 +1,15 @@
 """Coordinator for Kocom Wallpad integration."""
 import asyncio
 import logging
+import random
 import socket
 import time
 from collections import deque
-from datetime import timedelta
-from typing import Any
+from typing import Any, NamedTuple
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
@@ -20,33 +21,151 @@ from .const import (
     CONF_INIT_TEMP,
     CONF_INIT_FAN_MODE,
     CONF_ENABLED_DEVICES,
+    CONF_ACK_TIMEOUT,
+    CONF_COMMAND_DEBOUNCE,
+    CONF_WARMUP_TIME,
+    CONF_DEBUG_CAPTURE,
     DEFAULT_RS485_FLOOR,
     DEFAULT_LIGHT_COUNT,
     DEFAULT_INIT_TEMP,
     DEFAULT_INIT_FAN_MODE,
     DEFAULT_POLLING_INTERVAL,
-    HEADER,
-    TRAILER,
-    PACKET_SIZE,
-    CHKSUM_POSITION,
+    DEFAULT_ACK_TIMEOUT,
+    DEFAULT_COMMAND_DEBOUNCE,
+    DEFAULT_WARMUP_TIME,
+    DEFAULT_DEBUG_CAPTURE,
+    DISCOVERY_TIMEOUT,
+    DISCOVERY_RETRY_INTERVAL,
+    DISCOVERY_RETRIES,
+    STALENESS_BUDGETS,
+    REFRESH_SPACING,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
+    CONNECT_TIMEOUT,
+    RECONNECT_BACKOFF_BASE,
+    RECONNECT_BACKOFF_MAX,
+    BUS_SILENCE_TIMEOUT,
+    WATCHDOG_INTERVAL,
+    COMMAND_CONNECT_WAIT,
+    KEEPALIVE_IDLE,
+    KEEPALIVE_INTERVAL,
+    KEEPALIVE_COUNT,
+    LOOP_LAG_INTERVAL,
     READ_WRITE_GAP,
-    DEVICE_WALLPAD,
-    DEVICE_LIGHT,
-    DEVICE_GAS,
-    DEVICE_THERMO,
-    DEVICE_ELEVATOR,
-    DEVICE_FAN,
-    CMD_STATE,
-    CMD_QUERY,
-    TYPE_SEND,
-    ROOM_LIVINGROOM,
+    BUS_TRANSMIT_WINDOW,
+    BUS_MAX_IDLE_WAIT,
     ROOM_NAMES,
     SEQ_CODES,
 )
+from .capture import BusCapture, CAPTURE_RX_CHUNK, CAPTURE_TX_FRAME
+from .codec import DeviceCodec, create_codec
+from .metrics import Histogram, KocomMetrics
+from .timing import BusRhythm, RttEstimator
+from .protocol import (
+    VALUE_SIZE,
+    WALLPAD_ID,
+    CODE_LIGHT,
+    CODE_GAS,
+    CODE_THERMO,
+    CODE_ELEVATOR,
+    CODE_FAN,
+    CMD_STATE_CODE,
+    CMD_QUERY_CODE,
+    KocomFrame,
+    PacketDecoder,
+    build_packet,
+    checksum,
+    validate_packet,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
+DEVICE_CODES = {
+    "light": CODE_LIGHT,
+    "gas": CODE_GAS,
+    "fan": CODE_FAN,
+    "elevator": CODE_ELEVATOR,
+    "thermo": CODE_THERMO,
+}
+ROOM_CODES = {name: int(code, 16) for name, code in ROOM_NAMES.items()}
+
+
+class DeviceRoute(NamedTuple):
+    """Decoding route of an enabled device."""
+
+    device_key: str
+    device_type: str
+    codec: DeviceCodec
+    listeners: list[tuple[CALLBACK_TYPE, set[str] | None]]
+
+
+class DeviceQueue:
+    """Command queue for a single destination device."""
+
+    __slots__ = (
+        "lock", "depth", "max_depth", "sent", "wait_total", "wait_max", "wait_histogram"
+    )
+
+    def __init__(self, wait_histogram: Histogram | None = None) -> None:
+        """Initialize."""
+        self.lock = asyncio.Lock()
+        # 모든 기기의 대기 시간을 모으는 공용 히스토그램
+        self.wait_histogram = wait_histogram
+        self.depth = 0
+        self.max_depth = 0
+        self.sent = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def __aenter__(self) -> None:
+        """Wait for this device's turn."""
+        queued_at = time.monotonic()
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+        try:
+            await self.lock.acquire()
+        finally:
+            self.depth -= 1
+
+        wait = time.monotonic() - queued_at
+        self.sent += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        if self.wait_histogram is not None:
+            self.wait_histogram.add(wait)
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Let the next command for this device run."""
+        self.lock.release()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return queue statistics."""
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "wait_avg": self.wait_total / self.sent if self.sent else 0.0,
+            "wait_max": self.wait_max,
+        }
+
+
+class PendingWrite:
+    """Commands waiting in the debounce window, merged with newer writes."""
+
+    __slots__ = ("device_type", "commands", "deadline", "future")
+
+    def __init__(
+        self, device_type: str, command: str, value: Any, deadline: float
+    ) -> None:
+        """Initialize."""
+        self.device_type = device_type
+        # command -> value, 요청된 순서대로 하나의 값에 이어서 적용
+        self.commands: dict[str, Any] = {command: value}
+        self.deadline = deadline
+        self.future = asyncio.get_running_loop().create_future()
+
+
 class KocomCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Kocom data."""
 
@@ -61,23 +180,89 @@ class KocomCoordinator(DataUpdateCoordinator):
         self.init_temp = self.config.get(CONF_INIT_TEMP, DEFAULT_INIT_TEMP)
         self.init_fan_mode = self.config.get(CONF_INIT_FAN_MODE, DEFAULT_INIT_FAN_MODE)
         self.enabled_devices = self.config.get(CONF_ENABLED_DEVICES, [])
+        self.ack_timeout = self.config.get(CONF_ACK_TIMEOUT, DEFAULT_ACK_TIMEOUT)
+        self.command_debounce = self.config.get(
+            CONF_COMMAND_DEBOUNCE, DEFAULT_COMMAND_DEBOUNCE
+        )
+        self.warmup_time = self.config.get(CONF_WARMUP_TIME, DEFAULT_WARMUP_TIME)
+        self.capture: BusCapture | None = None
+        if self.config.get(CONF_DEBUG_CAPTURE, DEFAULT_DEBUG_CAPTURE):
+            self.capture = BusCapture(hass.config.path(f"{DOMAIN}_{entry.entry_id}.cap"))
         
-        self.sock = None
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
         self.last_read_time = 0
-        self.send_lock = asyncio.Lock()
+        self.last_write_time = 0
+        self.connected_at = 0
+        # 연결되어 있는 동안 설정됨, 끊긴 동안 명령은 잠시 기다리거나 거부
+        self.connected = asyncio.Event()
+        self.bus_lock = asyncio.Lock()
+        # 송신 후 bus_lock을 잡은 채 응답을 기다리는 중이면 True
+        self.ack_window_open = False
+        self.bus_rhythm = BusRhythm()
+        # device type -> ACK 왕복 시간 추정치 (응답 타임아웃 결정)
+        self.rtt: dict[str, RttEstimator] = {}
+        self.command_queues: dict[int, DeviceQueue] = {}
+        # (device id, field) -> 아직 전송되지 않은 명령
+        self.pending_writes: dict[tuple[int, str], PendingWrite] = {}
+        # device key -> (콜백, 관심 있는 필드) 목록
+        self.device_listeners: dict[str, list[tuple[CALLBACK_TYPE, set[str] | None]]] = {}
+        # 수신 데이터 한 덩어리를 처리하는 동안 모아 두는 변경 (device key -> route, 바뀐 필드)
+        self._pending_changes: dict[str, tuple[DeviceRoute, set[str]]] | None = None
+
+        # 설정에 따라 한 번만 만드는 라우팅 테이블
+        self.routes = self._build_routes()
+        self.device_ids = {
+            route.device_key: device_id for device_id, route in self.routes.items()
+        }
+        # (device id, seq, cmd) -> 응답(ACK)을 기다리는 Future와 보낸 상태 값 (상태 명령만)
+        self.pending_acks: dict[
+            tuple[int, int, int], tuple[asyncio.Future, bytes | None]
+        ] = {}
+        # 최근 수신 패킷 기록 (디버깅용)
         self.cache_data = deque(maxlen=100)
+        # device id -> 해당 기기 상태를 담은 가장 최근 ACK 패킷
+        self.device_frames: dict[int, KocomFrame] = {}
+        # device id -> 마지막으로 처리한 상태 값과 처리 통계
+        self.last_values: dict[int, bytes] = {}
+        self.frame_counts: dict[int, dict[str, int]] = {}
+        self.decoder = PacketDecoder()
         self.read_task = None
-
-        # Initialize data dictionary
-        self.data = {}
+        self.metrics = KocomMetrics()
+        # 재시작 시 바로 복원할 기기 상태 스냅샷
+        self.store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+        )
+        # device key -> 상태가 마지막으로 바뀐 시각 (epoch)
+        self.state_times: dict[str, float] = {}
+        # 스냅샷에서 복원된 뒤 아직 버스로 확인하지 못한 기기
+        self.stale_devices: set[str] = set()
+        self.lag_task: asyncio.Task | None = None
+        self.watchdog_task: asyncio.Task | None = None
+        self.refresh_task: asyncio.Task | None = None
+        # 탐색/재동기화/명령 전송 등 종료 시 함께 취소할 백그라운드 태스크
+        self.background_tasks: set[asyncio.Task] = set()
+        # device id -> 버스에서 마지막으로 상태를 확인한 시각 / 마지막 조회 시각
+        self.last_seen: dict[int, float] = {}
+        self.last_refresh: dict[int, float] = {}
+        # device id -> 상태를 다시 조회하기 전까지 허용하는 시간
+        self.staleness_budgets = {
+            device_id: budget
+            for device_id, route in self.routes.items()
+            if (budget := STALENESS_BUDGETS.get(route.device_type)) is not None
+        }
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_POLLING_INTERVAL),
+            # 주기적인 전체 갱신 대신 기기별 갱신 스케줄러(_refresh_loop)를 사용
+            update_interval=None,
         )
 
+        # Initialize data dictionary (DataUpdateCoordinator.__init__ sets it to None)
+        self.data = {}
+
     # async def _async_update_data(self) -> dict[str, Any]:
     #     """Fetch data from Kocom wallpad."""
     #     try:
@@ -107,54 +292,286 @@ class KocomCoordinator(DataUpdateCoordinator):
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from Kocom wallpad."""
         try:
-            if not self.sock:
+            if self.read_task is None:
+                if restored := await self._async_restore_snapshot():
+                    # 저장된 상태로 바로 시작하고, 연결과 갱신은 읽기 루프가 백그라운드에서 처리
+                    self.read_task = asyncio.create_task(self._read_loop())
+                    return restored
                 await self._connect()
-                data = {}
-                for device_str in self.enabled_devices:
-                    parts = device_str.split("_")
-                    device_type = parts[0]
-                    room = parts[1] if len(parts) > 1 else "livingroom"
-                    device_id = self._get_device_id(device_type, room)
-                    if device_id:
-                        result = await self._query_device(device_id)
-                        _LOGGER.info(f"Query device: {device_id}, result: {result}")
-                        if result:
-                            data[device_str] = result
-                return data
+                return await self._async_discover_devices()
             else:
+                # 연결이 끊기면 읽기 루프가 다시 연결하므로 여기서는 캐시만 반환
                 _LOGGER.info("Polling interval reached - returning cached data")
                 return self.data if hasattr(self, 'data') and self.data else {}
         except Exception as err:
             _LOGGER.error(f"Error updating data: {err}")
-            await self._reconnect()
+            await self._close()
             raise UpdateFailed(f"Error communicating with device: {err}")
 
+    async def _async_discover_devices(self) -> dict[str, Any]:
+        """Query all enabled devices at once and wait for a bounded time."""
+        device_ids = self.device_ids
+        if self.warmup_time:
+            await self._async_warmup(device_ids)
+
+        # 대기 중 버스에서 이미 상태를 받은 기기는 조회하지 않음
+        # (읽기 루프가 그동안 반영한 상태를 잃지 않도록 self.data에 직접 채움)
+        data = self.data
+        # 나머지 기기에 동시에 조회 요청 (버스 송신 간격은 _transmit에서 조절)
+        tasks = {
+            device_str: asyncio.create_task(self._query_device(device_id))
+            for device_str, device_id in device_ids.items()
+            if device_str not in data
+        }
+        if not tasks:
+            return data
+        await asyncio.wait(tasks.values(), timeout=DISCOVERY_TIMEOUT)
+
+        missing = {}
+        for device_str, task in tasks.items():
+            result = task.result() if task.done() and not task.exception() else None
+            _LOGGER.info(f"Query device: {device_str}, result: {result}")
+            if result:
+                self._apply_state(self.routes[device_ids[device_str]], result)
+            elif device_str not in data:
+                missing[device_str] = task
+
+        if missing:
+            # 응답하지 않은 기기는 설정을 막지 않고 백그라운드에서 채움
+            _LOGGER.info(f"Devices not answered yet: {list(missing)}")
+            self._async_create_background_task(
+                self._async_discover_missing(missing), f"{DOMAIN} discovery"
+            )
+        return data
+
+    async def _async_warmup(self, device_ids: dict[str, int]) -> None:
+        """Only listen to the bus until every device was seen or time runs out."""
+        _LOGGER.info(f"Listening to bus traffic for {self.warmup_time}s before querying")
+        deadline = time.monotonic() + self.warmup_time
+        while any(device_str not in self.data for device_str in device_ids):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(remaining, 0.5))
+        _LOGGER.info(f"Devices seen during warmup: {list(self.data)}")
+
+    async def _async_discover_missing(self, missing: dict[str, asyncio.Task]) -> None:
+        """Fill in devices that did not answer during discovery."""
+        device_ids = self.device_ids
+        for attempt in range(DISCOVERY_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(DISCOVERY_RETRY_INTERVAL)
+                missing = {
+                    device_str: asyncio.create_task(self._query_device(device_ids[device_str]))
+                    for device_str in missing
+                }
+
+            await asyncio.wait(missing.values())
+            for device_str, task in missing.items():
+                result = None if task.exception() else task.result()
+                if result and device_str not in self.data:
+                    # 해당 기기의 엔티티에만 알림
+                    self._apply_state(self.routes[device_ids[device_str]], result)
+
+            missing = {d: t for d, t in missing.items() if d not in self.data}
+            if not missing:
+                return
+
+        _LOGGER.warning(f"Devices did not answer: {list(missing)}")
+
+    async def _async_restore_snapshot(self) -> dict[str, Any] | None:
+        """Load the saved device states, marking them stale until the bus confirms them."""
+        try:
+            snapshot = await self.store.async_load()
+        except Exception as err:
+            _LOGGER.warning(f"Could not load saved device states: {err}")
+            return None
+        if not snapshot:
+            return None
+
+        for device_type, saved in snapshot.get("rtt", {}).items():
+            self.rtt[device_type] = RttEstimator(**saved)
+
+        data = {}
+        for device_key, saved in snapshot.get("devices", {}).items():
+            # 설정에서 빠진 기기는 복원하지 않음
+            if device_key in self.device_ids:
+                data[device_key] = saved["state"]
+                self.state_times[device_key] = saved["updated"]
+        if not data:
+            return None
+
+        self.stale_devices = set(data)
+        _LOGGER.info(f"Restored saved states: {list(data)}")
+        return data
+
+    @callback
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the device states to save."""
+        return {
+            "devices": {
+                device_key: {
+                    "state": state,
+                    "updated": self.state_times.get(device_key, 0),
+                }
+                for device_key, state in self.data.items()
+            },
+            "rtt": {
+                device_type: estimator.as_dict()
+                for device_type, estimator in self.rtt.items()
+            },
+        }
+
+    @callback
+    def _mark_updated(self, device_key: str) -> None:
+        """Record a fresh device state and schedule a debounced snapshot save."""
+        self.state_times[device_key] = time.time()
+        self.stale_devices.discard(device_key)
+        if self._pending_changes is None:
+            # 묶음 처리 중이면 _publish_changes에서 한 번만 저장
+            self.store.async_delay_save(self._snapshot_data, STORAGE_SAVE_DELAY)
+
     async def _connect(self) -> None:
         """Connect to RS485 socket server."""
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.settimeout(10)
-            await self.hass.async_add_executor_job(
-                self.sock.connect, (self.socket_server, self.socket_port)
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.socket_server, self.socket_port),
+                timeout=CONNECT_TIMEOUT,
             )
-            self.sock.settimeout(DEFAULT_POLLING_INTERVAL + 15)
             _LOGGER.info(f"Connected to {self.socket_server}:{self.socket_port}")
-            
+            self._set_keepalive(self.writer.get_extra_info("socket"))
+            # 새 연결에서는 이전 연결의 잘린 데이터를 버림
+            self.decoder.reset()
+            self.connected_at = time.monotonic()
+            self.connected.set()
+
             if self.read_task is None or self.read_task.done():
                 self.read_task = asyncio.create_task(self._read_loop())
+            if self.lag_task is None or self.lag_task.done():
+                self.lag_task = asyncio.create_task(self._monitor_loop_lag())
+            if self.watchdog_task is None or self.watchdog_task.done():
+                self.watchdog_task = asyncio.create_task(self._watch_bus())
+            if self.refresh_task is None or self.refresh_task.done():
+                self.refresh_task = asyncio.create_task(self._refresh_loop())
         except Exception as e:
             _LOGGER.error(f"Connection error: {e}")
             raise
 
+    @staticmethod
+    def _set_keepalive(sock: socket.socket | None) -> None:
+        """Enable TCP keepalive so a dead gateway is noticed by the OS."""
+        if sock is None:
+            return
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # 세부 설정은 지원하는 플랫폼에서만 적용
+        for option, value in (
+            ("TCP_KEEPIDLE", KEEPALIVE_IDLE),
+            ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+            ("TCP_KEEPCNT", KEEPALIVE_COUNT),
+        ):
+            if hasattr(socket, option):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
     async def _reconnect(self) -> None:
-        """Reconnect to RS485 socket server."""
+        """Reconnect to RS485 socket server, retrying with backoff."""
+        # 스냅샷으로 시작한 뒤의 첫 연결은 재연결로 세지 않음
+        if self.connected_at:
+            self.metrics.reconnects += 1
         await self._close()
-        await asyncio.sleep(10)
-        await self._connect()
+
+        attempt = 0
+        while True:
+            try:
+                await self._connect()
+                break
+            except (OSError, asyncio.TimeoutError):
+                # 첫 재시도는 바로, 이후에는 지수적으로 늘어나는 지연 + 지터
+                delay = min(RECONNECT_BACKOFF_MAX, RECONNECT_BACKOFF_BASE * 2 ** attempt)
+                delay = random.uniform(delay / 2, delay)
+                attempt += 1
+                _LOGGER.warning("Reconnect attempt %d failed, retrying in %.1fs", attempt, delay)
+                await asyncio.sleep(delay)
+
+        # 끊긴 동안 놓친 상태 변화(또는 복원된 상태)를 다시 조회
+        self._async_create_background_task(self._async_resync(), f"{DOMAIN} resync")
+
+    @callback
+    def _async_create_background_task(self, target: Any, name: str) -> asyncio.Task:
+        """Create a background task that is cancelled on shutdown."""
+        task = self.hass.async_create_background_task(target, name)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+
+    async def _async_resync(self) -> None:
+        """Query all devices again after a reconnect."""
+        await asyncio.gather(
+            *(self._async_refresh_device(device_id) for device_id in self.device_ids.values())
+        )
+
+    async def _async_refresh_device(self, device_id: int) -> None:
+        """Query a device and apply the state it answers with."""
+        self.last_refresh[device_id] = time.monotonic()
+        result = await self._send_command(device_id, CMD_QUERY_CODE)
+        if result is not None:
+            route = self.routes[device_id]
+            if state := route.codec.decode(result.value):
+                self._apply_state(route, state)
+
+    async def _refresh_loop(self) -> None:
+        """Query, one at a time, the devices whose state is older than their budget."""
+        while True:
+            # 조회를 일정 간격으로 흩어 버스에 몰리지 않도록 함
+            await asyncio.sleep(REFRESH_SPACING)
+            if not self.connected.is_set():
+                continue
+            device_id = self._most_stale_device()
+            if device_id is not None:
+                self.metrics.refresh_queries += 1
+                await self._async_refresh_device(device_id)
+
+    def _most_stale_device(self) -> int | None:
+        """Return the device furthest past its staleness budget, if any."""
+        now = time.monotonic()
+        stale_id = None
+        worst = 1.0
+        for device_id, budget in self.staleness_budgets.items():
+            # 응답하지 않는 기기도 예산마다 한 번만 다시 조회
+            seen = max(
+                self.last_seen.get(device_id, 0), self.last_refresh.get(device_id, 0)
+            )
+            overdue = (now - seen) / budget
+            if overdue > worst:
+                stale_id, worst = device_id, overdue
+        return stale_id
+
+    async def _watch_bus(self) -> None:
+        """Probe the connection when the bus has been silent for too long."""
+        while True:
+            await asyncio.sleep(WATCHDOG_INTERVAL)
+            if not self.connected.is_set():
+                continue
+            silent = time.monotonic() - max(self.last_read_time, self.connected_at)
+            if silent < BUS_SILENCE_TIMEOUT:
+                continue
+
+            # 조용한 버스일 수도 있으므로 기기 하나에 조회를 보내 확인
+            device_id = next(iter(self.device_ids.values()), None)
+            if device_id is not None and await self._send_command(device_id, CMD_QUERY_CODE):
+                continue
+            if time.monotonic() - self.last_read_time < BUS_SILENCE_TIMEOUT:
+                continue
+
+            _LOGGER.warning("No data from the bus for %.0fs. Reconnecting...", silent)
+            # 연결을 끊으면 읽기 루프가 EOF를 받고 다시 연결함
+            if self.writer is not None:
+                self.writer.transport.abort()
 
     async def _close(self) -> None:
         """Close connection."""
-        if self.read_task:
+        self.connected.clear()
+        # 읽기 루프 자신이 재연결하는 경우에는 태스크를 취소하지 않음
+        if self.read_task and self.read_task is not asyncio.current_task():
             self.read_task.cancel()
             try:
                 await self.read_task
@@ -162,76 +579,97 @@ class KocomCoordinator(DataUpdateCoordinator):
                 pass
             self.read_task = None
         
-        if self.sock:
+        if self.writer:
             try:
-                self.sock.close()
-            except:
+                self.writer.close()
+                await self.writer.wait_closed()
+            except Exception:
                 pass
-            self.sock = None
+        self.reader = None
+        self.writer = None
 
     async def _read_loop(self) -> None:
         """Continuously read from socket with improved stability."""
-        buf = ""
         _LOGGER.info("Kocom read loop started")
         
         while True:
             try:
-                if self.sock is None:
-                    await asyncio.sleep(5)
+                if self.reader is None:
+                    await self._reconnect()
                     continue
 
-                # 비동기적으로 소켓 데이터 수신
-                data = await self.hass.async_add_executor_job(self.sock.recv, 1024)
+                # 이벤트 루프에서 직접 소켓 데이터 수신
+                data = await self.reader.read(1024)
                 if not data:
                     _LOGGER.warning("Socket connection lost. Reconnecting...")
                     await self._reconnect()
                     continue
-                
-                # 수신 데이터를 hex로 변환하여 버퍼에 추가
-                buf += data.hex()
-                self.last_read_time = time.time()
-
-                # 헤더(aa55)를 찾을 때까지 앞부분 제거
-                while len(buf) >= 4:
-                    header_idx = buf.find(HEADER)
-                    if header_idx == -1:
-                        # 헤더가 없으면 마지막 2자(잠재적 헤더 시작)만 남기고 버림
-                        buf = buf[-2:]
-                        break
-                    if header_idx > 0:
-                        buf = buf[header_idx:]
-                    
-                    # 패킷 사이즈만큼 데이터가 쌓였는지 확인
-                    if len(buf) >= PACKET_SIZE * 2:
-                        packet = buf[:PACKET_SIZE * 2]
-                        if self._validate_packet(packet):
-                            # 유효한 패킷 처리 (await 추가)
-                            await self._process_packet(packet)
-                        
-                        # 처리한 패킷만큼 버퍼에서 제거
-                        buf = buf[PACKET_SIZE * 2:]
-                    else:
-                        break
-
-            except socket.timeout:
-                continue
+
+                await self._handle_received(data)
+
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                # _LOGGER.error(f"Read error in loop: {e}")
-                await asyncio.sleep(5)
+                _LOGGER.warning(f"Read error: {e}. Reconnecting...")
                 await self._reconnect()
 
-    def _validate_packet(self, packet: str) -> bool:
+    async def _handle_received(self, data: bytes) -> None:
+        """Handle a chunk of data received from the socket."""
+        self.last_read_time = time.monotonic()
+        # 버스를 잡고 응답을 기다리는 동안 받은 데이터만 우리 명령에 대한 응답으로 봄
+        self.bus_rhythm.observe(self.last_read_time, own=self.ack_window_open)
+        if self.capture is not None:
+            self.capture.record(CAPTURE_RX_CHUNK, data)
+
+        # 수신 데이터에서 완성된 패킷만 바이트 단위로 분리하고,
+        # 그 안의 상태 변경은 모두 반영한 뒤 기기마다 한 번만 알림
+        packets = self.decoder.feed(data)
+        if packets:
+            self._pending_changes = {}
+            try:
+                for packet in packets:
+                    await self._process_packet(packet)
+            finally:
+                changes, self._pending_changes = self._pending_changes, None
+                self._publish_changes(changes)
+
+        metrics = self.metrics
+        metrics.bytes_received += len(data)
+        metrics.frames.add(len(packets))
+        metrics.read_processing.add(time.monotonic() - self.last_read_time)
+
+    async def _monitor_loop_lag(self) -> None:
+        """Measure how late the event loop wakes up, i.e. how busy Home Assistant is."""
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self.metrics.loop_lag.add(
+                max(0.0, time.monotonic() - start - LOOP_LAG_INTERVAL)
+            )
+
+    def _validate_packet(self, packet: bytes) -> bool:
         """Validate packet checksum and trailer."""
-        chksum_calc = self._checksum(packet[len(HEADER):CHKSUM_POSITION*2])
-        chksum_buf = packet[CHKSUM_POSITION*2:CHKSUM_POSITION*2+2]
-        return (chksum_calc == chksum_buf and 
-                packet[-len(TRAILER):] == TRAILER)
+        return validate_packet(packet)
 
-    async def _process_packet(self, packet: str) -> None:
+    async def _process_packet(self, packet: bytes) -> None:
         """Process received packet."""
-        parsed = self._parse_packet(packet)
-        self.cache_data.appendleft(parsed)
-        _LOGGER.info(f"Received: {packet}, type: %s, src: %s, dest: %s", parsed["type"], parsed["src"], parsed["dest"])
+        frame = self._parse_packet(packet)
+        self.cache_data.appendleft(frame)
+        if frame.is_ack:
+            # 월패드의 상태 패킷과 기기의 응답 모두 그 기기 상태가 최신이라는 뜻
+            device_id = frame.dest if frame.src == WALLPAD_ID else frame.src
+            self.device_frames[device_id] = frame
+            self.last_seen[device_id] = frame.time
+
+        # 월패드가 주기적으로 반복하는 같은 상태 패킷은 파싱 없이 버림
+        if frame.is_ack and frame.src == WALLPAD_ID and self._is_repeated_state(frame):
+            return
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Received: %s, type: %s, src: %04x, dest: %04x",
+                packet.hex(), "ack" if frame.is_ack else "send", frame.src, frame.dest
+            )
 
         # UI/외부 장치에서 변경된 상태를 실시간으로 반영 (CMD_QUERY는 제외함, 난방도 제외함)
         # Received: aa5530dc00010036003a00000000000000007d0d0d, type: ack, src: 3600    -> x
@@ -248,277 +686,486 @@ class KocomCoordinator(DataUpdateCoordinator):
         # if parsed["type"] == "ack" and parsed["cmd"] != CMD_QUERY and parsed["src"] != DEVICE_WALLPAD + "00":
         # if parsed["type"] == "ack" and parsed["cmd"] != CMD_QUERY and parsed["src"] != DEVICE_WALLPAD + "00" and parsed["src"][:2] != DEVICE_THERMO:
         # if parsed["type"] == "ack" and parsed["cmd"] != CMD_QUERY and parsed["src"] == DEVICE_WALLPAD + "00":
-        if parsed["type"] == "ack" and parsed["src"] == DEVICE_WALLPAD + "00":
-            await self._update_state_from_packet(parsed)
+        if frame.is_ack and frame.dest == WALLPAD_ID:
+            # 명령을 기다리는 요청이 있으면 즉시 응답 전달
+            # (월패드의 조회에 대한 기기 응답도 같은 seq로 오므로 명령과 값까지 확인)
+            pending = self.pending_acks.get((frame.src, frame.seq, frame.cmd))
+            if pending is not None:
+                future, sent_value = pending
+                if not future.done() and (
+                    sent_value is None
+                    or self._codec(frame.src).acknowledges(sent_value, frame.value)
+                ):
+                    future.set_result(frame)
 
-    async def _update_state_from_packet(self, parsed: dict) -> None:
-        """Update coordinator data from received packet."""
-        dest_device = parsed["dest"][:2]
-        device_id = parsed["dest"]
-        updated = False
-
-        if dest_device == DEVICE_LIGHT:
-            device_key = "light"
-            if device_key in self.enabled_devices:
-                state = self._parse_value(device_id, parsed["value"])
-                if state:
-                    self.data[device_key] = state
-                    updated = True
-
-        elif dest_device == DEVICE_THERMO:
-            room_code = device_id[2:4]
-            room_name = None
-            for name, code in ROOM_NAMES.items():
-                if code == room_code:
-                    room_name = name
-                    break
-
-            if room_name:
-                device_key = f"thermo_{room_name}"
-                if device_key in self.enabled_devices:
-                    state = self._parse_value(device_id, parsed["value"])
-                    if state:
-                        self.data[device_key] = state
-                        updated = True
-
-        elif dest_device == DEVICE_FAN:
-            device_key = "fan"
-            if device_key in self.enabled_devices:
-                state = self._parse_value(device_id, parsed["value"])
-                if state:
-                    self.data[device_key] = state
-                    updated = True
-
-        elif dest_device == DEVICE_GAS:
-            device_key = "gas"
-            if device_key in self.enabled_devices:
-                state = self._parse_value(device_id, parsed["value"])
-                if state:
-                    self.data[device_key] = state
-                    updated = True
-
-        if updated:
-            self.async_set_updated_data(self.data)
-            _LOGGER.info(f"UI updated ({device_id}): {state}")
-
-    def _parse_packet(self, hex_data: str) -> dict:
-        """Parse hex packet."""
-        type_h = hex_data[4:7]
-        seq_h = hex_data[7:8]
-        dest_h = hex_data[10:14]
-        src_h = hex_data[14:18]
-        cmd_h = hex_data[18:20]
-        value_h = hex_data[20:36]
-        
-        # Determine packet type
-        packet_type = "send" if type_h == TYPE_SEND else "ack"
-        
+        if frame.is_ack and frame.src == WALLPAD_ID:
+            counts = self.frame_counts[frame.dest]
+            counts["forwarded"] += 1
+            if await self._update_state_from_packet(frame):
+                counts["changed"] += 1
+
+    def _is_repeated_state(self, frame: KocomFrame) -> bool:
+        """Return true if a state frame repeats the last value of its device."""
+        counts = self.frame_counts.get(frame.dest)
+        if counts is None:
+            counts = self.frame_counts[frame.dest] = {
+                "suppressed": 0, "forwarded": 0, "changed": 0
+            }
+
+        value = frame.value
+        if self.last_values.get(frame.dest) == value:
+            counts["suppressed"] += 1
+            return True
+        self.last_values[frame.dest] = value
+        return False
+
+    @property
+    def frame_stats(self) -> dict[str, dict[str, int]]:
+        """Return per-device counts of suppressed, forwarded and changed state frames."""
         return {
-            "type": packet_type,
-            "seq": seq_h,
-            "dest": dest_h,
-            "src": src_h,
-            "cmd": cmd_h,
-            "value": value_h,
-            "time": time.time(),
-            "raw": hex_data,
+            f"{device_id:04x}": dict(counts)
+            for device_id, counts in self.frame_counts.items()
         }
 
-    async def _query_device(self, device_id: str) -> dict | None:
+    async def _update_state_from_packet(self, frame: KocomFrame) -> bool:
+        """Update coordinator data from received packet."""
+        # 사용하지 않는 기기는 라우팅 테이블에 없음
+        route = self.routes.get(frame.dest)
+        if route is None:
+            return False
+
+        state = route.codec.decode(frame.value)
+        if state and self._apply_state(route, state, from_bus=True):
+            _LOGGER.debug("UI updated (%04x): %s", frame.dest, state)
+            return True
+        return False
+
+    def _apply_state(
+        self, route: DeviceRoute, state: dict, from_bus: bool = False
+    ) -> bool:
+        """Store a device state and notify only entities whose fields changed."""
+        device_key = route.device_key
+        if not from_bus:
+            # 월패드 상태 패킷이 아닌 경로로 쓴 상태는 다음 상태 패킷과 다시 비교해야 함
+            self.last_values.pop(self.device_ids[device_key], None)
+        if device_key in self.stale_devices:
+            self.stale_devices.discard(device_key)
+        old_state = self.data.get(device_key) or {}
+        changed = {
+            field for field in state.keys() | old_state.keys()
+            if state.get(field) != old_state.get(field)
+        }
+        # 처음 받은 상태는 모든 값이 비어 있어도 저장
+        if not changed and device_key in self.data:
+            return False
+
+        self.data[device_key] = state
+        self._mark_updated(device_key)
+        pending = self._pending_changes
+        if pending is None:
+            self._async_notify_device(route.listeners, changed)
+        elif device_key in pending:
+            # 같은 덩어리 안에서 다시 바뀐 기기는 필드만 합침
+            pending[device_key][1].update(changed)
+            self.metrics.coalesced_updates += 1
+        else:
+            pending[device_key] = (route, changed)
+        return True
+
+    @callback
+    def async_set_optimistic(self, device_key: str, fields: dict[str, Any]) -> None:
+        """Update device fields right after a command, until the bus reports them."""
+        state = self.data.get(device_key)
+        if state is None:
+            return
+        state.update(fields)
+        # 명령이 무시되었으면 월패드가 반복하는 원래 상태 패킷으로 되돌아가도록 함
+        self.last_values.pop(self.device_ids[device_key], None)
+
+    @callback
+    def _publish_changes(self, changes: dict[str, tuple[DeviceRoute, set[str]]]) -> None:
+        """Notify listeners and schedule one snapshot save for a batch of changes."""
+        if not changes:
+            return
+        self.metrics.batch_publishes += 1
+        for route, changed in changes.values():
+            self._async_notify_device(route.listeners, changed)
+        self.store.async_delay_save(self._snapshot_data, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_add_device_listener(
+        self,
+        device_key: str,
+        update_callback: CALLBACK_TYPE,
+        fields: set[str] | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for state changes of one device, optionally only some fields."""
+        listener = (update_callback, fields)
+        listeners = self.device_listeners.setdefault(device_key, [])
+        listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def _async_notify_device(
+        self, listeners: list[tuple[CALLBACK_TYPE, set[str] | None]], changed: set[str]
+    ) -> None:
+        """Call the device listeners interested in the changed fields."""
+        for update_callback, fields in list(listeners):
+            if fields is None or not fields.isdisjoint(changed):
+                update_callback()
+
+    def _parse_packet(self, packet: bytes) -> KocomFrame:
+        """Parse packet."""
+        return KocomFrame.from_packet(packet)
+
+    async def _query_device(self, device_id: int) -> dict | None:
         """Query device state."""
-        for item in self.cache_data:
-            if time.time() - item["time"] > DEFAULT_POLLING_INTERVAL:
-                break
-            if item["type"] == "ack" and item["dest"] == device_id:
-                return self._parse_value(device_id, item["value"])
+        frame = self.device_frames.get(device_id)
+        if frame and time.monotonic() - frame.time <= DEFAULT_POLLING_INTERVAL:
+            return self._parse_value(device_id, frame.value)
         
-        result = await self._send_command(device_id, CMD_QUERY)
+        result = await self._send_command(device_id, CMD_QUERY_CODE)
         if result:
-            return self._parse_value(device_id, result["value"])
+            return self._parse_value(device_id, result.value)
 
         return None
 
     async def _send_command(
-        self, dest: str, cmd: str, value: str = "0"*16, 
-        src: str = DEVICE_WALLPAD + "00"
-    ) -> dict | None:
+        self, dest: int, cmd: int, value: bytes = bytes(VALUE_SIZE),
+        src: int = WALLPAD_ID
+    ) -> KocomFrame | None:
         """Send command to device."""
-        async with self.send_lock:
-            for seq_h in SEQ_CODES.keys():
-                payload = TYPE_SEND + seq_h + "00" + dest + src + cmd + value
-                checksum = self._checksum(payload)
-                packet = HEADER + payload + checksum + TRAILER
-                
-                if self.last_read_time > 0:
-                    gap = time.time() - self.last_read_time
-                    if gap < READ_WRITE_GAP:
-                        await asyncio.sleep(READ_WRITE_GAP - gap)
-                
-                try:
-                    await self.hass.async_add_executor_job(
-                        self.sock.send, bytes.fromhex(packet)
-                    )
-                    # _LOGGER.info(f"Sent: {packet}")
-                    
-                    await asyncio.sleep(1.5)
-                    
-                    for item in reversed(list(self.cache_data)):
-                        if item["dest"] == src and item["src"] == dest:
-                            return item
-                except Exception as e:
-                    # _LOGGER.error(f"Send error: {e}")
-                    break
+        # 같은 기기로 가는 명령만 순서대로 대기하고, 다른 기기는 서로 막지 않음
+        async with self._device_queue(dest):
+            return await self._send_packets(dest, cmd, value, src)
+
+    async def _send_packets(
+        self, dest: int, cmd: int, value: bytes, src: int
+    ) -> KocomFrame | None:
+        """Transmit a command, retrying with each sequence code until ACKed."""
+        metrics = self.metrics
+        device_type = self._device_type_name(dest)
+        estimator = self.rtt.get(device_type)
+        if estimator is None:
+            estimator = self.rtt[device_type] = RttEstimator()
+        if not self.connected.is_set():
+            # 재연결 중이면 잠깐만 기다리고, 그래도 끊겨 있으면 바로 실패
+            try:
+                await asyncio.wait_for(self.connected.wait(), COMMAND_CONNECT_WAIT)
+            except asyncio.TimeoutError:
+                _LOGGER.warning("Not connected, command to %04x rejected", dest)
+                metrics.commands_rejected += 1
+                return None
+
+        for attempt, seq_h in enumerate(SEQ_CODES.keys(), 1):
+            seq = int(seq_h, 16)
+            packet = build_packet(seq, dest, src, cmd, value)
+            
+            key = (dest, seq, cmd)
+            future = asyncio.get_running_loop().create_future()
+            self.pending_acks[key] = (future, value if cmd == CMD_STATE_CODE else None)
+            if cmd == CMD_STATE_CODE:
+                # 상태를 바꾸는 명령 뒤의 상태 패킷은 이전과 같은 값이어도 다시 반영
+                self.last_values.pop(dest, None)
+            try:
+                metrics.attempts[attempt] += 1
+                # 기기 종류별로 측정한 왕복 시간으로 응답 대기 시간을 정함
+                timeout = estimator.timeout(attempt, self.ack_timeout)
+                async with self.bus_lock:
+                    await self._transmit(packet)
+                    sent_at = time.monotonic()
+                    # 반이중 버스이므로 응답이 올 것으로 예상되는 동안은 다른 기기가 송신하지 않음
+                    self.ack_window_open = True
+                    try:
+                        await asyncio.wait(
+                            (future,),
+                            timeout=min(timeout, estimator.ack_window(self.ack_timeout)),
+                        )
+                    finally:
+                        self.ack_window_open = False
+                # 예상보다 늦는 응답은 버스를 놓아준 뒤 남은 시간 동안 기다림
+                result = await asyncio.wait_for(
+                    future, max(0.0, sent_at + timeout - time.monotonic())
+                )
+                # 시도마다 seq가 달라 응답이 어느 송신의 것인지 분명하므로 항상 측정에 사용
+                rtt = time.monotonic() - sent_at
+                estimator.update(rtt)
+                metrics.record_ack(device_type, rtt, attempt)
+                return result
+            except asyncio.TimeoutError:
+                continue
+            except Exception as e:
+                # _LOGGER.error(f"Send error: {e}")
+                break
+            finally:
+                self.pending_acks.pop(key, None)
+        else:
+            # 모든 시도가 시간 초과면 다음 명령은 더 오래 기다림
+            estimator.timed_out()
+        metrics.command_failures += 1
         return None
 
-    def _checksum(self, data_h: str) -> str:
+    def _device_queue(self, device_id: int) -> DeviceQueue:
+        """Return the command queue for a device."""
+        queue = self.command_queues.get(device_id)
+        if queue is None:
+            queue = self.command_queues[device_id] = DeviceQueue(self.metrics.queue_wait)
+        return queue
+
+    async def _transmit(self, packet: bytes) -> None:
+        """Write a packet to the half-duplex bus, called with bus_lock held."""
+        # 월패드의 폴링 버스트를 피해 예상되는 유휴 구간까지 기다림 (최대 BUS_MAX_IDLE_WAIT)
+        wait_start = time.monotonic()
+        min_gap = READ_WRITE_GAP
+        while True:
+            now = time.monotonic()
+            delay = self.bus_rhythm.transmit_delay(
+                now, self.last_write_time, BUS_TRANSMIT_WINDOW, min_gap
+            )
+            # 최소 간격은 한 번만 기다림 (쉬지 않는 버스에서 무한정 밀리지 않도록)
+            min_gap = 0.0
+            remaining = BUS_MAX_IDLE_WAIT - (now - wait_start)
+            if delay <= 0 or remaining <= 0:
+                break
+            # 기다리는 동안 새 트래픽이 들어올 수 있으므로 다시 계산
+            await asyncio.sleep(min(delay, remaining))
+        self.metrics.bus_wait.add(time.monotonic() - wait_start)
+
+        self.writer.write(packet)
+        await self.writer.drain()
+        self.last_write_time = time.monotonic()
+        if self.capture is not None:
+            self.capture.record(CAPTURE_TX_FRAME, packet)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Sent: %s", packet.hex())
+
+    @property
+    def command_queue_stats(self) -> dict[str, dict[str, Any]]:
+        """Return per-device command queue statistics."""
+        return {
+            f"{device_id:04x}": queue.as_dict()
+            for device_id, queue in self.command_queues.items()
+        }
+
+    @property
+    def metrics_stats(self) -> dict[str, Any]:
+        """Return runtime metrics, including decoder error counts."""
+        return {
+            **self.metrics.as_dict(),
+            "checksum_failures": self.decoder.checksum_errors,
+            "dropped_bytes": self.decoder.dropped_bytes,
+        }
+
+    def _device_type_name(self, device_id: int) -> str:
+        """Return the device type of a device id for metrics."""
+        route = self.routes.get(device_id)
+        if route is not None:
+            return route.device_type
+        for device_type, code in DEVICE_CODES.items():
+            if code == device_id >> 8:
+                return device_type
+        return f"{device_id >> 8:02x}"
+
+    def _checksum(self, data: bytes) -> int:
         """Calculate checksum."""
-        sum_buf = sum(bytes.fromhex(data_h))
-        return f"{sum_buf % 256:02x}"
+        return checksum(data)
 
-    def _get_device_id(self, device_type: str, room: str = "livingroom") -> str | None:
+    def _get_device_id(self, device_type: str, room: str = "livingroom") -> int | None:
         """Get device ID from type and room."""
-        device_map = {
-            "light": DEVICE_LIGHT,
-            "gas": DEVICE_GAS,
-            "fan": DEVICE_FAN,
-            "elevator": DEVICE_ELEVATOR,
-            "thermo": DEVICE_THERMO,
-        }
-        
-        device_code = device_map.get(device_type)
-        if not device_code:
+        device_code = DEVICE_CODES.get(device_type)
+        if device_code is None:
             return None
         
-        room_code = ROOM_NAMES.get(room, ROOM_LIVINGROOM)
-        return device_code + room_code
-
-    def _parse_value(self, device_id: str, value: str) -> dict:
-        """Parse device value."""
-        device_type = device_id[:2]
-
-        if device_type == DEVICE_THERMO:
-            # value format: HHMM TT 00 CC 00000000
-            # HH: heat mode (11=heat, 01=off)
-            # MM: away mode
-            # TT: set temp
-            # CC: current temp
-            # def thermo_parse(value):
-            #     ret = { 'heat_mode': 'heat' if value[:2]=='11' else 'off',
-            #             'away': 'true' if value[2:4]=='01' else 'false',
-            #             'set_temp': int(value[4:6], 16) if value[:2]=='11' else int(config.get('User', 'init_temp')),
-            #             'cur_temp': int(value[8:10], 16)}
-            #     return ret
-            heat_mode = "heat" if value[:2] == "11" else "off"
-            set_temp = int(value[4:6], 16) if value[:2] == "11" else self.init_temp
-            cur_temp = int(value[8:10], 16) if value[8:10] != "00" else None
-            result = {
-                "heat_mode": heat_mode,
-                "set_temp": set_temp,
-                "cur_temp": cur_temp,
-                "value": value
-            }
-            return result
+        return device_code << 8 | ROOM_CODES.get(room, ROOM_CODES["livingroom"])
 
-        elif device_type == DEVICE_LIGHT:
-            result = {}
-            for i in range(1, self.light_count + 1):
-                result[f"light_{i}"] = "on" if value[i*2-2:i*2] != "00" else "off"
-            return result
+    def _codec(self, device_id: int) -> DeviceCodec:
+        """Return the value codec of a device."""
+        route = self.routes.get(device_id)
+        if route is None:
+            return self._create_codec(device_id >> 8)
+        return route.codec
 
-        elif device_type == DEVICE_FAN:
-            preset_map = {"40": "Low", "80": "Medium", "c0": "High"}
-            state = "on" if value[:2] == "11" else "off"
-            preset = "Off" if state == "off" else preset_map.get(value[4:6], "Off")
-            return {"state": state, "preset": preset}
+    def _create_codec(self, device_code: int) -> DeviceCodec:
+        """Create the value codec for a device code."""
+        return create_codec(
+            device_code, light_count=self.light_count, init_temp=self.init_temp
+        )
 
-        elif device_type == DEVICE_GAS:
-            return {"state": "on"}
+    def _build_routes(self) -> dict[int, DeviceRoute]:
+        """Build the device id -> route table for the enabled devices."""
+        routes = {}
+        for device_key in self.enabled_devices:
+            device_type, _, room = device_key.partition("_")
+            device_id = self._get_device_id(device_type, room or "livingroom")
+            if device_id is None:
+                continue
+            routes[device_id] = DeviceRoute(
+                device_key,
+                device_type,
+                self._create_codec(device_id >> 8),
+                self.device_listeners.setdefault(device_key, []),
+            )
+        return routes
 
-        return {}
+    def _parse_value(self, device_id: int, value: bytes) -> dict:
+        """Parse device value."""
+        route = self.routes.get(device_id)
+        if route is None:
+            return {}
+        return route.codec.decode(value)
 
     async def async_send_command(
         self, device_type: str, room: str, command: str, 
         value: Any = None
     ) -> bool:
         """Send command to device."""
+        if device_type == "light" and isinstance(value, dict) and "light_id" in value:
+            return await self.async_set_lights({value["light_id"]: command == "on"})
+
         device_id = self._get_device_id(device_type, room)
         if not device_id:
             return False
-        
-        cmd_value = self._build_command_value(device_type, command, value, device_id)
-        if not cmd_value:
-            return False
-        
-        result = await self._send_command(device_id, CMD_STATE, cmd_value)
-        _LOGGER.info(f"Sent Command Device: {device_id}, Value: {cmd_value}")
-        return result is not None
 
-    def _build_command_value(
-        self, device_type: str, command: str, value: Any, device_id: str
-    ) -> str | None:
-        """Build command value hex string by patching existing values."""
+        return await self._queue_write(device_id, device_type, command, value)
+
+    async def async_set_lights(self, changes: dict[int, bool]) -> bool:
+        """Switch several lights with a single packet."""
+        device_id = self._get_device_id("light")
+        return await self._queue_write(device_id, "light", "set", dict(changes))
 
+    async def _queue_write(
+        self, device_id: int, device_type: str, command: str, value: Any
+    ) -> bool:
+        """Queue a write, merging it with a pending write to the same field."""
+        # 같은 기기/항목에 대한 연속 명령은 마지막 값 하나로 병합
+        key = (device_id, self._command_field(device_type, command))
+        pending = self.pending_writes.get(key)
+        if pending is None:
+            pending = PendingWrite(
+                device_type, command, value, time.monotonic() + self.command_debounce
+            )
+            self.pending_writes[key] = pending
+            self._async_create_background_task(
+                self._flush_write(key, pending), f"{DOMAIN} write {device_id:04x}"
+            )
+        else:
+            commands = pending.commands
+            if device_type == "light":
+                # 조명은 여러 개의 변경 사항을 하나의 비트맵으로 합침
+                commands[command] = {**commands[command], **value}
+            else:
+                if device_type == "fan":
+                    # 켜기/끄기/풍량은 모두 같은 값을 덮어쓰므로 마지막 명령만 남김
+                    commands.clear()
+                # 같은 명령은 마지막 값으로 바꾸고 나중에 적용되도록 순서도 뒤로 옮김
+                commands.pop(command, None)
+                commands[command] = value
+            pending.deadline = time.monotonic() + self.command_debounce
+
+        return await asyncio.shield(pending.future)
+
+    @staticmethod
+    def _command_field(device_type: str, command: str) -> str:
+        """Return the part of the device state a command writes."""
         if device_type == "light":
-            hex_value = "0" * 16
-            if isinstance(value, dict) and "light_id" in value:
-                light_id = value["light_id"]
-                onoff = "ff" if command == "on" else "00"
-                pos = light_id * 2 - 2
-                hex_value = hex_value[:pos] + onoff + hex_value[pos+2:]
-            return hex_value
-
-        elif device_type == "thermo":
-            room_name = next((name for name, code in ROOM_NAMES.items() if code == device_id[2:4]), None)
-            device_key = f"thermo_{room_name}"
-            # if device_key not in self.data:
-            #     self.data[device_key].set("value", "0100050014000000") # 기본값
-            # current_raw = self.data[device_key].get("value")
-            current_raw = self.data[device_key].get("value", "0100050014000000")
-            if command == "heat_mode":
-                new_mode = "11" if value == "heat" else "01"
-                temp = f"{self.init_temp:02x}"
-                # 앞 4자리(모드+00) + 초기값 온도(2자리) + 나머지 10자리 유지
-                return new_mode + "00" + temp + current_raw[6:]
-            elif command == "set_temp":
-                new_temp = f"{int(value):02x}"
-                # 앞 4자리(모드+00) 유지 + 새로운 온도(2자리) + 나머지 10자리 유지
-                return current_raw[:4] + new_temp + current_raw[6:]
-            return current_raw
-
-        elif device_type == "fan":
-            speed_map = {"Off": "00", "Low": "40", "Medium": "80", "High": "c0"}
-            onoff = "1000" if value == "Off" else "1100"
-            speed = speed_map.get(value, "80")
-            return onoff + speed + "0" * 10
-
-        elif device_type == "gas" and command == "off":
-            return "0" * 16
-        
-        elif device_type == "elevator" and command == "on":
-            return "0" * 16
+            return "lights"
+        if device_type == "fan":
+            # on/off/preset 모두 같은 값(전원+풍량)을 덮어씀
+            return "mode"
+        if device_type == "thermo":
+            # 모드와 온도는 같은 8바이트 값에 들어가므로 하나의 쓰기로 합침
+            return "value"
+        return command
 
-        return None
+    async def _flush_write(self, key: tuple[int, str], pending: PendingWrite) -> None:
+        """Send a pending write once its debounce window has passed."""
+        device_id = key[0]
+        try:
+            while (delay := pending.deadline - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+
+            # 앞선 명령이 끝날 때까지는 계속 병합될 수 있도록 차례가 온 뒤에 꺼냄
+            async with self._device_queue(device_id):
+                self.pending_writes.pop(key, None)
+                cmd_value = self._build_command_value(device_id, pending.commands)
+                result = None
+                if cmd_value:
+                    result = await self._send_packets(
+                        device_id, CMD_STATE_CODE, cmd_value, WALLPAD_ID
+                    )
+                    _LOGGER.info(
+                        "Sent Command Device: %04x, Value: %s", device_id, cmd_value.hex()
+                    )
+                    if result is not None:
+                        self._apply_sent_value(device_id, cmd_value)
+            pending.future.set_result(result is not None)
+        except Exception as err:
+            pending.future.set_exception(err)
+        finally:
+            if self.pending_writes.get(key) is pending:
+                del self.pending_writes[key]
+            if not pending.future.done():
+                pending.future.cancel()
+
+    def _build_command_value(
+        self, device_id: int, commands: dict[str, Any]
+    ) -> bytes | None:
+        """Build command value by patching the current device state."""
+        route = self.routes.get(device_id)
+        if route is None:
+            codec, state = self._create_codec(device_id >> 8), {}
+        else:
+            codec, state = route.codec, self.data.get(route.device_key, {})
+
+        cmd_value = None
+        for command, value in commands.items():
+            encoded = codec.encode(command, value, state)
+            if encoded is None:
+                continue
+            cmd_value = encoded
+            # 다음 명령은 앞 명령이 반영된 값 위에 적용
+            if codec.command_is_state:
+                state = {**state, **codec.decode(encoded)}
+        return cmd_value
+
+    def _apply_sent_value(self, device_id: int, cmd_value: bytes) -> None:
+        """Apply an acknowledged command value as the device's new state."""
+        route = self.routes.get(device_id)
+        # 명령 값이 곧 기기 상태인 경우만 반영 (가스/엘리베이터 명령은 상태가 아님)
+        if route is None or not route.codec.command_is_state:
+            return
+        if state := route.codec.decode(cmd_value):
+            self._apply_state(route, state)
 
     async def async_shutdown(self) -> None:
         """Shutdown coordinator."""
+        for task in (self.lag_task, self.watchdog_task, self.refresh_task):
+            if task is not None:
+                task.cancel()
+        self.lag_task = self.watchdog_task = self.refresh_task = None
+        for task in list(self.background_tasks):
+            task.cancel()
+        self.background_tasks.clear()
         await self._close()
+        if self.data:
+            await self.store.async_save(self._snapshot_data())
+        if self.capture is not None:
+            await self.capture.async_close()
 
     async def async_send_query(self) -> None:
         """Send query."""
         _LOGGER.info("Send query started")
         try:
-            if not self.sock:
+            if self.read_task is None:
                 await self._connect()
 
-            for device_str in self.enabled_devices:
-                parts = device_str.split("_")
-                device_type = parts[0]
-                room = parts[1] if len(parts) > 1 else "livingroom"
-
-                device_id = self._get_device_id(device_type, room)
-                if device_id:
-                    await self._send_command(device_id, CMD_QUERY)
+            for device_id in self.device_ids.values():
+                await self._send_command(device_id, CMD_QUERY_CODE)
         except Exception as err:
             _LOGGER.error(f"Error query data: {err}")
-            await self._reconnect()
             raise UpdateFailed(f"Error communicating with device: {err}")
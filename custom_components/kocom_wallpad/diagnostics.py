@@ -0,0 +1,34 @@
+"""Diagnostics support for Kocom Wallpad."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import KocomCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: KocomCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "config": dict(entry.data),
+        "connected": coordinator.writer is not None,
+        "data": coordinator.data,
+        "stale_devices": sorted(coordinator.stale_devices),
+        "metrics": coordinator.metrics_stats,
+        "bus_rhythm": coordinator.bus_rhythm.as_dict(),
+        "rtt": {
+            device_type: {
+                **estimator.as_dict(),
+                "timeout": estimator.timeout(1, coordinator.ack_timeout),
+            }
+            for device_type, estimator in coordinator.rtt.items()
+        },
+        "frame_stats": coordinator.frame_stats,
+        "command_queues": coordinator.command_queue_stats,
+    }
@@ -0,0 +1,26 @@
+"""Base entity for Kocom Wallpad integration."""
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import KocomCoordinator
+
+
+class KocomEntity(CoordinatorEntity[KocomCoordinator]):
+    """Entity updated only when its own device fields change."""
+
+    _device_key: str
+    _device_fields: set[str] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Register device listener when added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_device_listener(
+                self._device_key, self._handle_device_update, self._device_fields
+            )
+        )
+
+    @callback
+    def _handle_device_update(self) -> None:
+        """Handle a state change of this entity's device."""
+        self.async_write_ha_state()
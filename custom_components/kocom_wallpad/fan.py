@@ -6,10 +6,10 @@ from homeassistant.components.fan import FanEntity, FanEntityFeature
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, FAN_PRESETS
 from .coordinator import KocomCoordinator
+from .entity import KocomEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,7 +28,7 @@ async def async_setup_entry(
     async_add_entities([KocomFan(coordinator)])
 
 
-class KocomFan(CoordinatorEntity, FanEntity):
+class KocomFan(KocomEntity, FanEntity):
     """Representation of a Kocom Fan."""
 
     _attr_supported_features = (
@@ -37,6 +37,7 @@ class KocomFan(CoordinatorEntity, FanEntity):
         FanEntityFeature.PRESET_MODE
     )
     _attr_preset_modes = FAN_PRESETS
+    _device_key = "fan"
 
     def __init__(self, coordinator: KocomCoordinator) -> None:
         """Initialize the fan."""
@@ -72,9 +73,7 @@ class KocomFan(CoordinatorEntity, FanEntity):
         
         if result:
             # 즉시 UI 상태 업데이트
-            if "fan" in self.coordinator.data:
-                self.coordinator.data["fan"]["state"] = "on"
-                self.coordinator.data["fan"]["preset"] = mode
+            self.coordinator.async_set_optimistic("fan", {"state": "on", "preset": mode})
             self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
@@ -85,9 +84,7 @@ class KocomFan(CoordinatorEntity, FanEntity):
         
         if result:
             # 즉시 UI 상태 업데이트
-            if "fan" in self.coordinator.data:
-                self.coordinator.data["fan"]["state"] = "off"
-                self.coordinator.data["fan"]["preset"] = "Off"
+            self.coordinator.async_set_optimistic("fan", {"state": "off", "preset": "Off"})
             self.async_write_ha_state()
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
@@ -98,7 +95,8 @@ class KocomFan(CoordinatorEntity, FanEntity):
         
         if result:
             # 즉시 UI 상태 업데이트
-            if "fan" in self.coordinator.data:
-                self.coordinator.data["fan"]["state"] = "on" if preset_mode != "Off" else "off"
-                self.coordinator.data["fan"]["preset"] = preset_mode
+            self.coordinator.async_set_optimistic("fan", {
+                "state": "on" if preset_mode != "Off" else "off",
+                "preset": preset_mode,
+            })
             self.async_write_ha_state()
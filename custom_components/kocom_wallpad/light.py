@@ -6,10 +6,10 @@ from homeassistant.components.light import LightEntity, ColorMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import KocomCoordinator
+from .entity import KocomEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,16 +34,18 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class KocomLight(CoordinatorEntity, LightEntity):
+class KocomLight(KocomEntity, LightEntity):
     """Representation of a Kocom Light."""
 
     _attr_color_mode = ColorMode.ONOFF
     _attr_supported_color_modes = {ColorMode.ONOFF}
+    _device_key = "light"
 
     def __init__(self, coordinator: KocomCoordinator, light_id: int) -> None:
         """Initialize the light."""
         super().__init__(coordinator)
         self._light_id = light_id
+        self._device_fields = {f"light_{light_id}"}
         self._attr_name = f"거실 조명 {light_id}"
         self._attr_unique_id = f"{coordinator.entry.entry_id}_light_{light_id}"
 
@@ -55,22 +57,21 @@ class KocomLight(CoordinatorEntity, LightEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the light on."""
-        result = await self.coordinator.async_send_command(
-            "light", "livingroom", "on", {"light_id": self._light_id}
-        )
+        # 그룹/장면에서 동시에 켜는 조명은 하나의 패킷으로 합쳐서 전송
+        result = await self.coordinator.async_set_lights({self._light_id: True})
         if result:
             # 즉시 UI 상태 업데이트
-            if "light" in self.coordinator.data:
-                self.coordinator.data["light"][f"light_{self._light_id}"] = "on"
+            self.coordinator.async_set_optimistic(
+                "light", {f"light_{self._light_id}": "on"}
+            )
             self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
-        result = await self.coordinator.async_send_command(
-            "light", "livingroom", "off", {"light_id": self._light_id}
-        )
+        result = await self.coordinator.async_set_lights({self._light_id: False})
         if result:
             # 즉시 UI 상태 업데이트
-            if "light" in self.coordinator.data:
-                self.coordinator.data["light"][f"light_{self._light_id}"] = "off"
+            self.coordinator.async_set_optimistic(
+                "light", {f"light_{self._light_id}": "off"}
+            )
             self.async_write_ha_state()
@@ -0,0 +1,163 @@
+"""Runtime metrics for Kocom Wallpad integration."""
+from __future__ import annotations
+
+import bisect
+import time
+from collections import Counter, deque
+from typing import Any
+
+from .const import METRICS_RATE_WINDOW
+
+# 지연 히스토그램 구간 상한 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations."""
+
+    __slots__ = ("buckets", "counts", "count", "total", "max")
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize."""
+        self.buckets = buckets
+        # 마지막 칸은 가장 큰 구간을 넘는 값
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        """Record a value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, ratio: float) -> float | None:
+        """Return the bucket upper bound below which the given ratio of values fall."""
+        if not self.count:
+            return None
+        target = self.count * ratio
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return histogram summary."""
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else None,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "max": self.max if self.count else None,
+            "buckets": {
+                f"le_{bound}": count for bound, count in zip(self.buckets, self.counts)
+            } | {"inf": self.counts[-1]},
+        }
+
+
+class RateMeter:
+    """Events per second over a sliding window of one second slots."""
+
+    __slots__ = ("window", "slots", "total")
+
+    def __init__(self, window: int = METRICS_RATE_WINDOW) -> None:
+        """Initialize."""
+        self.window = window
+        # (초, 횟수) 목록
+        self.slots: deque[list[int]] = deque()
+        self.total = 0
+
+    def add(self, count: int = 1, now: float | None = None) -> None:
+        """Record events."""
+        second = int(time.monotonic() if now is None else now)
+        slots = self.slots
+        if slots and slots[-1][0] == second:
+            slots[-1][1] += count
+        else:
+            slots.append([second, count])
+        self.total += count
+        self._expire(second)
+
+    def rate(self, now: float | None = None) -> float:
+        """Return events per second over the window."""
+        self._expire(int(time.monotonic() if now is None else now))
+        return sum(count for _, count in self.slots) / self.window
+
+    def _expire(self, second: int) -> None:
+        """Drop slots older than the window."""
+        slots = self.slots
+        while slots and slots[0][0] <= second - self.window:
+            slots.popleft()
+
+
+class KocomMetrics:
+    """Counters and histograms for the bus, gateway and Home Assistant side."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.frames = RateMeter()
+        self.bytes_received = 0
+        self.reconnects = 0
+        # 장치 종류 -> ACK 지연
+        self.ack_latency: dict[str, Histogram] = {}
+        # 몇 번째 시퀀스 시도에서 ACK를 받았는지, 그리고 모두 실패한 횟수
+        self.attempts: Counter[int] = Counter()
+        self.acked_on_attempt: Counter[int] = Counter()
+        self.command_failures = 0
+        # 오래된 기기 상태를 갱신하려고 보낸 조회
+        self.refresh_queries = 0
+        # 연결이 끊긴 동안 보내지 못하고 거부한 명령
+        self.commands_rejected = 0
+        self.queue_wait = Histogram()
+        # 한 번에 받은 패킷들의 상태 변경을 모아 알린 횟수와 그로 인해 생략된 알림
+        self.batch_publishes = 0
+        self.coalesced_updates = 0
+        # 송신 전에 버스 유휴 구간을 기다린 시간
+        self.bus_wait = Histogram()
+        # 수신한 데이터 한 덩어리를 처리하는 데 걸린 시간
+        self.read_processing = Histogram()
+        # 이벤트 루프가 예정보다 늦게 깨어난 시간
+        self.loop_lag = Histogram()
+
+    def record_ack(self, device_type: str, latency: float, attempt: int) -> None:
+        """Record an acknowledged command."""
+        histogram = self.ack_latency.get(device_type)
+        if histogram is None:
+            histogram = self.ack_latency[device_type] = Histogram()
+        histogram.add(latency)
+        self.acked_on_attempt[attempt] += 1
+
+    @property
+    def retries(self) -> int:
+        """Return the number of retransmissions."""
+        return sum(count for attempt, count in self.attempts.items() if attempt > 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics."""
+        return {
+            "frames_per_second": self.frames.rate(),
+            "frames_received": self.frames.total,
+            "bytes_received": self.bytes_received,
+            "reconnects": self.reconnects,
+            "ack_latency": {
+                device_type: histogram.as_dict()
+                for device_type, histogram in self.ack_latency.items()
+            },
+            "attempts": dict(self.attempts),
+            "acked_on_attempt": dict(self.acked_on_attempt),
+            "retries": self.retries,
+            "command_failures": self.command_failures,
+            "refresh_queries": self.refresh_queries,
+            "commands_rejected": self.commands_rejected,
+            "queue_wait": self.queue_wait.as_dict(),
+            "batch_publishes": self.batch_publishes,
+            "coalesced_updates": self.coalesced_updates,
+            "bus_wait": self.bus_wait.as_dict(),
+            "read_processing": self.read_processing.as_dict(),
+            "loop_lag": self.loop_lag.as_dict(),
+        }
@@ -0,0 +1,202 @@
+"""RS485 packet framing for Kocom Wallpad integration."""
+from __future__ import annotations
+
+import time
+from typing import NamedTuple
+
+from .const import (
+    HEADER,
+    TRAILER,
+    PACKET_SIZE,
+    CHKSUM_POSITION,
+    DEVICE_WALLPAD,
+    DEVICE_LIGHT,
+    DEVICE_GAS,
+    DEVICE_THERMO,
+    DEVICE_ELEVATOR,
+    DEVICE_FAN,
+    CMD_STATE,
+    CMD_QUERY,
+    ROOM_LIVINGROOM,
+    TYPE_SEND,
+    TYPE_ACK,
+)
+
+HEADER_BYTES = bytes.fromhex(HEADER)
+TRAILER_BYTES = bytes.fromhex(TRAILER)
+
+# 패킷 내 필드 위치 (바이트 단위)
+# aa55 | 30 | T S | 00 | dest(2) | src(2) | cmd | value(8) | chksum | 0d0d
+TYPE_POSITION = 2
+SEQ_POSITION = 3
+DEST_POSITION = 5
+SRC_POSITION = 7
+CMD_POSITION = 9
+VALUE_POSITION = 10
+VALUE_SIZE = 8
+
+TYPE_SEND_CODE = int(TYPE_SEND, 16)
+TYPE_ACK_CODE = int(TYPE_ACK, 16)
+WALLPAD_ID = int(DEVICE_WALLPAD + ROOM_LIVINGROOM, 16)
+
+CODE_LIGHT = int(DEVICE_LIGHT, 16)
+CODE_GAS = int(DEVICE_GAS, 16)
+CODE_THERMO = int(DEVICE_THERMO, 16)
+CODE_ELEVATOR = int(DEVICE_ELEVATOR, 16)
+CODE_FAN = int(DEVICE_FAN, 16)
+
+CMD_STATE_CODE = int(CMD_STATE, 16)
+CMD_QUERY_CODE = int(CMD_QUERY, 16)
+
+
+def checksum(data: bytes | memoryview) -> int:
+    """Calculate checksum of the bytes between header and checksum."""
+    return sum(data) & 0xFF
+
+
+def validate_packet(packet: bytes | memoryview) -> bool:
+    """Validate packet checksum and trailer."""
+    return (
+        len(packet) == PACKET_SIZE
+        and checksum(packet[len(HEADER_BYTES):CHKSUM_POSITION]) == packet[CHKSUM_POSITION]
+        and packet[-len(TRAILER_BYTES):] == TRAILER_BYTES
+    )
+
+
+def build_packet(
+    seq: int, dest: int, src: int, cmd: int, value: bytes,
+    packet_type: int = TYPE_SEND_CODE,
+) -> bytes:
+    """Build a send (or ack) packet."""
+    payload = bytes((
+        packet_type >> 4,
+        (packet_type & 0x0F) << 4 | seq,
+        0,
+        dest >> 8, dest & 0xFF,
+        src >> 8, src & 0xFF,
+        cmd,
+    )) + value
+    return HEADER_BYTES + payload + bytes((checksum(payload),)) + TRAILER_BYTES
+
+
+class KocomFrame(NamedTuple):
+    """Received packet, decoded lazily from the raw bytes."""
+
+    raw: bytes
+    time: float
+
+    @classmethod
+    def from_packet(cls, packet: bytes) -> KocomFrame:
+        """Create a frame stamped with the current monotonic time."""
+        return cls(packet, time.monotonic())
+
+    @property
+    def type(self) -> int:
+        """Return packet type code (0x30b send, 0x30d ack)."""
+        return self.raw[TYPE_POSITION] << 4 | self.raw[SEQ_POSITION] >> 4
+
+    @property
+    def is_ack(self) -> bool:
+        """Return true if this is an ack packet."""
+        return self.type != TYPE_SEND_CODE
+
+    @property
+    def seq(self) -> int:
+        """Return sequence code (0xc-0xf)."""
+        return self.raw[SEQ_POSITION] & 0x0F
+
+    @property
+    def dest(self) -> int:
+        """Return destination device id (device code << 8 | room code)."""
+        return self.raw[DEST_POSITION] << 8 | self.raw[DEST_POSITION + 1]
+
+    @property
+    def dest_device(self) -> int:
+        """Return destination device code."""
+        return self.raw[DEST_POSITION]
+
+    @property
+    def dest_room(self) -> int:
+        """Return destination room code."""
+        return self.raw[DEST_POSITION + 1]
+
+    @property
+    def src(self) -> int:
+        """Return source device id (device code << 8 | room code)."""
+        return self.raw[SRC_POSITION] << 8 | self.raw[SRC_POSITION + 1]
+
+    @property
+    def src_device(self) -> int:
+        """Return source device code."""
+        return self.raw[SRC_POSITION]
+
+    @property
+    def src_room(self) -> int:
+        """Return source room code."""
+        return self.raw[SRC_POSITION + 1]
+
+    @property
+    def cmd(self) -> int:
+        """Return command code."""
+        return self.raw[CMD_POSITION]
+
+    @property
+    def value(self) -> bytes:
+        """Return the 8 byte value payload."""
+        return self.raw[VALUE_POSITION:VALUE_POSITION + VALUE_SIZE]
+
+
+class PacketDecoder:
+    """Streaming decoder that splits received bytes into packets."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._buf = bytearray()
+        self.packets = 0
+        self.checksum_errors = 0
+        self.dropped_bytes = 0
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Append received data and return all complete, valid packets."""
+        buf = self._buf
+        buf += data
+        packets = []
+        pos = 0
+        end = len(buf)
+
+        with memoryview(buf) as view:
+            while True:
+                header_idx = buf.find(HEADER_BYTES, pos)
+                if header_idx == -1:
+                    # 헤더가 없으면 마지막 1바이트(잠재적 헤더 시작)만 남기고 버림
+                    pos = max(pos, end - len(HEADER_BYTES) + 1)
+                    break
+                pos = header_idx
+
+                # 패킷 사이즈만큼 데이터가 쌓였는지 확인
+                if end - pos < PACKET_SIZE:
+                    break
+
+                # 복사 없이 버퍼 위에서 체크섬과 트레일러를 검사
+                if (
+                    checksum(view[pos + len(HEADER_BYTES):pos + CHKSUM_POSITION])
+                    == buf[pos + CHKSUM_POSITION]
+                    and buf.startswith(TRAILER_BYTES, pos + PACKET_SIZE - len(TRAILER_BYTES))
+                ):
+                    packets.append(view[pos:pos + PACKET_SIZE].tobytes())
+                    pos += PACKET_SIZE
+                else:
+                    # 손상된 패킷은 헤더만 건너뛰고 다음 헤더부터 다시 동기화
+                    self.checksum_errors += 1
+                    pos += len(HEADER_BYTES)
+
+        # 처리한 데이터는 한 번에 버퍼에서 제거
+        del buf[:pos]
+        self.packets += len(packets)
+        # 패킷이 되지 못하고 버려진 바이트 (재동기화 중 건너뛴 데이터)
+        self.dropped_bytes += pos - len(packets) * PACKET_SIZE
+        return packets
+
+    def reset(self) -> None:
+        """Discard any partially received data."""
+        self._buf.clear()
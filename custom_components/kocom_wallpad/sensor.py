@@ -1,17 +1,142 @@
 """Sensor platform for Kocom Wallpad."""
+from __future__ import annotations
+
 import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, METRICS_SCAN_INTERVAL
 from .coordinator import KocomCoordinator
+from .entity import KocomEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+# 진단 센서는 주기적으로 값을 다시 읽음 (상태 센서는 코디네이터가 갱신)
+SCAN_INTERVAL = timedelta(seconds=METRICS_SCAN_INTERVAL)
+
+
+def _ms(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def _worst_p95(histograms: dict[str, dict[str, Any]]) -> float | None:
+    """Return the highest p95 of several histograms."""
+    values = [h["p95"] for h in histograms.values() if h["p95"] is not None]
+    return max(values) if values else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class KocomMetricSensorDescription(SensorEntityDescription):
+    """Describes a Kocom metric sensor."""
+
+    value_fn: Callable[[dict[str, Any]], Any]
+    attributes_fn: Callable[[dict[str, Any]], dict[str, Any]] | None = None
+
+
+METRIC_SENSORS: tuple[KocomMetricSensorDescription, ...] = (
+    KocomMetricSensorDescription(
+        key="frames_per_second",
+        name="수신 패킷 속도",
+        icon="mdi:swap-horizontal",
+        native_unit_of_measurement="frames/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: round(m["frames_per_second"], 2),
+        attributes_fn=lambda m: {
+            "frames_received": m["frames_received"],
+            "bytes_received": m["bytes_received"],
+        },
+    ),
+    KocomMetricSensorDescription(
+        key="checksum_failures",
+        name="체크섬 오류",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda m: m["checksum_failures"],
+    ),
+    KocomMetricSensorDescription(
+        key="dropped_bytes",
+        name="버려진 바이트",
+        icon="mdi:delete-outline",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda m: m["dropped_bytes"],
+    ),
+    KocomMetricSensorDescription(
+        key="ack_latency",
+        name="ACK 지연",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: _ms(_worst_p95(m["ack_latency"])),
+        attributes_fn=lambda m: {
+            f"{device_type}_{stat}": _ms(histogram[stat])
+            for device_type, histogram in m["ack_latency"].items()
+            for stat in ("p50", "p95", "max")
+        },
+    ),
+    KocomMetricSensorDescription(
+        key="retries",
+        name="명령 재전송",
+        icon="mdi:repeat",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda m: m["retries"],
+        attributes_fn=lambda m: {
+            "attempts": m["attempts"],
+            "acked_on_attempt": m["acked_on_attempt"],
+            "command_failures": m["command_failures"],
+        },
+    ),
+    KocomMetricSensorDescription(
+        key="queue_wait",
+        name="명령 대기 시간",
+        icon="mdi:tray-full",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: _ms(m["queue_wait"]["p95"]),
+        attributes_fn=lambda m: {
+            "avg": _ms(m["queue_wait"]["avg"]),
+            "max": _ms(m["queue_wait"]["max"]),
+        },
+    ),
+    KocomMetricSensorDescription(
+        key="reconnects",
+        name="재연결 횟수",
+        icon="mdi:lan-disconnect",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda m: m["reconnects"],
+    ),
+    KocomMetricSensorDescription(
+        key="loop_lag",
+        name="이벤트 루프 지연",
+        icon="mdi:speedometer-slow",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: _ms(m["loop_lag"]["p95"]),
+        attributes_fn=lambda m: {
+            "loop_lag_max": _ms(m["loop_lag"]["max"]),
+            "read_processing_p95": _ms(m["read_processing"]["p95"]),
+            "read_processing_max": _ms(m["read_processing"]["max"]),
+        },
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -21,14 +146,20 @@ async def async_setup_entry(
     """Set up Kocom sensor."""
     coordinator: KocomCoordinator = hass.data[DOMAIN][entry.entry_id]
     
+    entities: list[SensorEntity] = [
+        KocomMetricSensor(coordinator, description) for description in METRIC_SENSORS
+    ]
     if "elevator" in coordinator.enabled_devices:
-        async_add_entities([KocomElevatorFloor(coordinator)])
+        entities.append(KocomElevatorFloor(coordinator))
+    async_add_entities(entities)
 
 
-class KocomElevatorFloor(CoordinatorEntity, SensorEntity):
+class KocomElevatorFloor(KocomEntity, SensorEntity):
     """Representation of Kocom Elevator Floor Sensor."""
 
     _attr_icon = "mdi:elevator"
+    _device_key = "elevator"
+    _device_fields = {"floor"}
 
     def __init__(self, coordinator: KocomCoordinator) -> None:
         """Initialize the sensor."""
@@ -41,3 +172,27 @@ class KocomElevatorFloor(CoordinatorEntity, SensorEntity):
         """Return the elevator floor."""
         data = self.coordinator.data.get("elevator", {})
         return data.get("floor", self.coordinator.rs485_floor)
+
+
+class KocomMetricSensor(SensorEntity):
+    """Diagnostic sensor showing a coordinator runtime metric."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = True
+    entity_description: KocomMetricSensorDescription
+
+    def __init__(
+        self, coordinator: KocomCoordinator, description: KocomMetricSensorDescription
+    ) -> None:
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_metric_{description.key}"
+
+    async def async_update(self) -> None:
+        """Read the latest metrics."""
+        metrics = self.coordinator.metrics_stats
+        description = self.entity_description
+        self._attr_native_value = description.value_fn(metrics)
+        if description.attributes_fn is not None:
+            self._attr_extra_state_attributes = description.attributes_fn(metrics)
@@ -11,6 +11,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import KocomCoordinator
+from .entity import KocomEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,10 +35,11 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class KocomGas(CoordinatorEntity, SwitchEntity):
+class KocomGas(KocomEntity, SwitchEntity):
     """Representation of a Kocom Gas Valve."""
 
     _attr_icon = "mdi:gas-cylinder"
+    _device_key = "gas"
 
     def __init__(self, coordinator: KocomCoordinator) -> None:
         """Initialize the gas valve."""
@@ -62,8 +64,7 @@ class KocomGas(CoordinatorEntity, SwitchEntity):
         )
         if result:
             # 즉시 UI 상태 업데이트
-            if "gas" in self.coordinator.data:
-                self.coordinator.data["gas"]["state"] = "off"
+            self.coordinator.async_set_optimistic("gas", {"state": "off"})
             self.async_write_ha_state()
 
 
@@ -0,0 +1,177 @@
+"""Bus timing (traffic rhythm and ACK round trips) for Kocom Wallpad integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    READ_WRITE_GAP,
+    BUS_BURST_GAP,
+    BUS_IDLE_GUARD,
+    BUS_MAX_BURST_LENGTH,
+    BUS_PERIOD_MIN,
+    BUS_PERIOD_MAX,
+    BUS_RHYTHM_ALPHA,
+    BUS_RHYTHM_MIN_SAMPLES,
+    BUS_RHYTHM_MAX_JITTER,
+    RTT_ALPHA,
+    RTT_BETA,
+    RTT_K,
+    RTT_MIN_VARIANCE,
+    RTT_MIN_TIMEOUT,
+    RTT_MAX_TIMEOUT,
+    RTT_MAX_BACKOFF,
+)
+
+
+class BusRhythm:
+    """Learn the wallpad's polling bursts and predict idle windows on the bus.
+
+    Received traffic is grouped into bursts: frames less than BUS_BURST_GAP
+    apart belong to the same burst. The interval between burst starts gives
+    the master's polling period, and the burst length how long the bus stays
+    busy each time. Both are smoothed with an EWMA.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.last_rx = 0.0
+        self.burst_start = 0.0
+        self.burst_end = 0.0
+        self.period: float | None = None
+        self.period_jitter = 0.0
+        self.burst_length = 0.0
+        self.samples = 0
+
+    def observe(self, now: float, own: bool = False) -> None:
+        """Record received bus traffic; own marks answers to our transmissions."""
+        self.last_rx = now
+        if own:
+            # 우리 명령에 대한 응답은 버스 점유로만 보고 월패드 주기 계산에서는 제외
+            return
+        if self.burst_end and now - self.burst_end < BUS_BURST_GAP:
+            # 같은 버스트가 이어지는 중
+            self.burst_end = now
+            return
+
+        if self.burst_start:
+            self._learn(now - self.burst_start, self.burst_end - self.burst_start)
+        self.burst_start = self.burst_end = now
+
+    def _learn(self, interval: float, length: float) -> None:
+        """Update the period and burst length estimates."""
+        alpha = BUS_RHYTHM_ALPHA
+        self.burst_length = max(length, self.burst_length * (1 - alpha) + length * alpha)
+        if not BUS_PERIOD_MIN <= interval <= BUS_PERIOD_MAX:
+            return
+        if self.period is None:
+            self.period = interval
+        else:
+            # 놓친 버스트가 있으면 간격이 주기의 배수가 됨
+            cycles = max(1, round(interval / self.period))
+            interval /= cycles
+            self.period_jitter += alpha * (abs(interval - self.period) - self.period_jitter)
+            self.period += alpha * (interval - self.period)
+        self.samples += 1
+
+    @property
+    def confident(self) -> bool:
+        """Return true if the polling period is regular enough to predict."""
+        return (
+            self.period is not None
+            and self.samples >= BUS_RHYTHM_MIN_SAMPLES
+            and self.period_jitter <= self.period * BUS_RHYTHM_MAX_JITTER
+        )
+
+    def transmit_delay(
+        self, now: float, last_write: float, duration: float,
+        min_gap: float = READ_WRITE_GAP,
+    ) -> float:
+        """Return how long to wait before a transmission taking duration seconds."""
+        # 마지막 수신/송신 이후 최소 간격
+        delay = max(0.0, max(self.last_rx, last_write) + min_gap - now)
+        if (
+            now - self.burst_end < BUS_BURST_GAP
+            and self.burst_end - self.burst_start < BUS_MAX_BURST_LENGTH
+        ):
+            # 월패드 버스트가 진행 중이면 끝날 때까지 기다림
+            # (너무 오래 이어지면 끝나지 않는 트래픽으로 보고 기다리지 않음)
+            delay = max(delay, self.burst_end + BUS_BURST_GAP - now)
+
+        if not self.confident:
+            return delay
+
+        # 다음 예상 버스트가 송신(+응답) 구간과 겹치면 그 버스트 뒤로 미룸
+        start = now + delay
+        period = self.period
+        cycles = max(1, -(-(start - self.burst_start) // period))
+        next_burst = self.burst_start + cycles * period
+        busy_from = next_burst - BUS_IDLE_GUARD
+        busy_until = next_burst + self.burst_length + BUS_IDLE_GUARD
+        previous_until = busy_until - period
+        if start < previous_until:
+            # 예상한 버스트가 아직 끝나지 않음
+            delay = previous_until - now
+        elif start + duration > busy_from:
+            delay = busy_until - now
+        return delay
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the learned rhythm."""
+        return {
+            "period": self.period,
+            "period_jitter": self.period_jitter,
+            "burst_length": self.burst_length,
+            "samples": self.samples,
+            "confident": self.confident,
+        }
+
+
+class RttEstimator:
+    """ACK round-trip time estimator (SRTT/RTTVAR as in RFC 6298)."""
+
+    __slots__ = ("srtt", "rttvar", "samples", "backoff")
+
+    def __init__(
+        self, srtt: float | None = None, rttvar: float = 0.0, samples: int = 0
+    ) -> None:
+        """Initialize."""
+        self.srtt = srtt
+        self.rttvar = rttvar
+        self.samples = samples
+        # 응답 없는 명령 뒤 타임아웃 배수, 다음 측정값에서 초기화 (저장하지 않음)
+        self.backoff = 1
+
+    def update(self, rtt: float) -> None:
+        """Add a measured round trip."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += RTT_BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += RTT_ALPHA * (rtt - self.srtt)
+        self.samples += 1
+        self.backoff = 1
+
+    def ack_window(self, default: float) -> float:
+        """Return how long an ACK is normally expected to take."""
+        if self.srtt is None:
+            # 측정값이 없으면 설정된 타임아웃에서 시작
+            rto = default
+        else:
+            rto = self.srtt + max(RTT_MIN_VARIANCE, RTT_K * self.rttvar)
+        return min(RTT_MAX_TIMEOUT, max(RTT_MIN_TIMEOUT, rto))
+
+    def timeout(self, attempt: int, default: float) -> float:
+        """Return the ACK timeout for the given attempt (1 = first transmission)."""
+        # 재시도마다 두 배로 늘려 느린 기기도 결국 응답을 받아 측정되도록 함
+        rto = self.ack_window(default) * self.backoff * 2 ** (attempt - 1)
+        return min(RTT_MAX_TIMEOUT, max(RTT_MIN_TIMEOUT, rto))
+
+    def timed_out(self) -> None:
+        """Back off the next timeouts after no attempt was acknowledged."""
+        # 측정값은 그대로 두고 (RFC 6298처럼) 다음 응답을 받을 때까지만 타임아웃을 늘림
+        self.backoff = min(RTT_MAX_BACKOFF, self.backoff * 2)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the estimate."""
+        return {"srtt": self.srtt, "rttvar": self.rttvar, "samples": self.samples}
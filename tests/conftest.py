@@ -0,0 +1,17 @@
+"""Test configuration for Kocom Wallpad integration."""
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = "custom_components.kocom_wallpad"
+
+sys.path.insert(0, str(ROOT))
+
+if importlib.util.find_spec("homeassistant") is None:
+    # Home Assistant 없이도 HA에 의존하지 않는 모듈(protocol, codec)은 테스트할 수 있도록
+    # 패키지 __init__ (플랫폼 설정)을 실행하지 않고 하위 모듈만 불러옴
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [str(ROOT / "custom_components" / "kocom_wallpad")]
+    sys.modules[PACKAGE] = package
@@ -0,0 +1,129 @@
+"""Round-trip tests for the device value codecs."""
+import itertools
+
+import pytest
+
+from custom_components.kocom_wallpad.codec import (
+    ElevatorCodec,
+    FanCodec,
+    GasCodec,
+    LightCodec,
+    ThermoCodec,
+    create_codec,
+)
+from custom_components.kocom_wallpad.protocol import (
+    CODE_FAN,
+    CODE_LIGHT,
+    CODE_THERMO,
+    VALUE_SIZE,
+)
+
+
+@pytest.mark.parametrize("set_temp", range(5, 41))
+def test_thermo_set_temp_round_trip(set_temp):
+    codec = ThermoCodec(init_temp=20)
+    state = codec.decode(bytes.fromhex("1100140016000000"))
+
+    state = codec.decode(codec.encode("set_temp", set_temp, state))
+
+    assert state["heat_mode"] == "heat"
+    assert state["set_temp"] == set_temp
+    assert state["cur_temp"] == 22
+
+
+@pytest.mark.parametrize("mode", ["heat", "off"])
+@pytest.mark.parametrize("current", ["1100180016000000", "0100050016000000"])
+def test_thermo_heat_mode_round_trip(mode, current):
+    codec = ThermoCodec(init_temp=23)
+    state = codec.decode(bytes.fromhex(current))
+
+    state = codec.decode(codec.encode("heat_mode", mode, state))
+
+    assert state["heat_mode"] == mode
+    assert state["set_temp"] == 23
+    assert state["cur_temp"] == 22
+
+
+def test_thermo_heat_mode_then_set_temp():
+    codec = ThermoCodec(init_temp=20)
+    state = codec.decode(bytes.fromhex("0100140016000000"))
+
+    state = codec.decode(codec.encode("heat_mode", "heat", state))
+    value = codec.encode("set_temp", 24, state)
+
+    assert value == bytes.fromhex("1100180016000000")
+
+
+def test_thermo_without_state_uses_default_value():
+    codec = ThermoCodec(init_temp=20)
+
+    assert codec.decode(codec.encode("set_temp", 25, {}))["cur_temp"] == 20
+
+
+@pytest.mark.parametrize("light_count", range(1, VALUE_SIZE + 1))
+def test_light_bitmaps_round_trip(light_count):
+    codec = LightCodec(light_count=light_count)
+    lights = range(1, light_count + 1)
+    off = codec.decode(bytes(VALUE_SIZE))
+
+    for bits in itertools.product((False, True), repeat=light_count):
+        state = codec.decode(codec.encode("set", dict(zip(lights, bits)), off))
+        assert state == {
+            f"light_{i}": "on" if on else "off" for i, on in zip(lights, bits)
+        }
+
+
+def test_light_change_keeps_other_lights():
+    codec = LightCodec(light_count=3)
+    state = codec.decode(bytes.fromhex("ff00ff0000000000"))
+
+    state = codec.decode(codec.encode("set", {2: True, 3: False}, state))
+
+    assert state == {"light_1": "on", "light_2": "on", "light_3": "off"}
+
+
+@pytest.mark.parametrize("preset", ["Off", "Low", "Medium", "High"])
+def test_fan_preset_round_trip(preset):
+    codec = FanCodec()
+
+    state = codec.decode(codec.encode("preset", preset, {}))
+
+    assert state == {"state": "off" if preset == "Off" else "on", "preset": preset}
+
+
+def test_gas_only_closes():
+    codec = GasCodec()
+
+    assert codec.encode("off", None, {}) == bytes(VALUE_SIZE)
+    assert codec.encode("on", None, {}) is None
+
+
+def test_elevator_calls_without_decoding_state():
+    codec = ElevatorCodec()
+
+    assert codec.encode("on", None, {}) == bytes(VALUE_SIZE)
+    assert codec.decode(bytes.fromhex("0700000000000000")) == {}
+
+
+def test_create_codec():
+    assert isinstance(create_codec(CODE_THERMO), ThermoCodec)
+    assert isinstance(create_codec(CODE_LIGHT, light_count=2), LightCodec)
+    assert isinstance(create_codec(CODE_FAN), FanCodec)
+    assert create_codec(0x99).encode("on", None, {}) is None
+
+
+def test_state_acks_must_echo_the_sent_value():
+    fan = FanCodec()
+    sent = fan.encode("preset", "High", {})
+
+    assert fan.acknowledges(sent, sent)
+    assert not fan.acknowledges(sent, fan.encode("preset", "Medium", {}))
+    assert GasCodec().acknowledges(bytes(VALUE_SIZE), bytes.fromhex("0100000000000000"))
+
+
+def test_thermo_ack_ignores_current_temperature():
+    codec = ThermoCodec()
+    sent = bytes.fromhex("1100180016000000")
+
+    assert codec.acknowledges(sent, bytes.fromhex("1100180019000000"))
+    assert not codec.acknowledges(sent, bytes.fromhex("0100180016000000"))
@@ -0,0 +1,124 @@
+"""Coordinator tests against the simulated RS485 socket server."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry  # noqa: E402
+
+from custom_components.kocom_wallpad.const import (  # noqa: E402
+    DOMAIN,
+    CONF_SOCKET_SERVER,
+    CONF_SOCKET_PORT,
+    CONF_LIGHT_COUNT,
+    CONF_ENABLED_DEVICES,
+    CONF_ACK_TIMEOUT,
+    CONF_COMMAND_DEBOUNCE,
+)
+from custom_components.kocom_wallpad.coordinator import KocomCoordinator  # noqa: E402
+from custom_components.kocom_wallpad.protocol import CODE_FAN, CMD_QUERY_CODE  # noqa: E402
+from tools.simulator import WallpadSimulator  # noqa: E402
+
+FAN_ID = CODE_FAN << 8
+
+
+@pytest.fixture
+async def start(hass, socket_enabled):
+    """Return a factory that starts a simulator and a connected coordinator."""
+    started = []
+
+    async def _start(**options):
+        simulator = WallpadSimulator(seed=1, **options)
+        await simulator.async_start(port=0)
+        entry = MockConfigEntry(domain=DOMAIN, data={
+            CONF_SOCKET_SERVER: "127.0.0.1",
+            CONF_SOCKET_PORT: simulator.port,
+            CONF_LIGHT_COUNT: 3,
+            CONF_ENABLED_DEVICES: ["light", "fan", "thermo_livingroom"],
+            CONF_ACK_TIMEOUT: 0.2,
+            CONF_COMMAND_DEBOUNCE: 0,
+        })
+        coordinator = KocomCoordinator(hass, entry)
+        started.append((simulator, coordinator))
+        await coordinator._connect()
+        return simulator, coordinator
+
+    yield _start
+    for simulator, coordinator in started:
+        await coordinator.async_shutdown()
+        await simulator.async_stop()
+
+
+async def test_dropped_answers_are_retried(start):
+    simulator, coordinator = await start(drop_rate=0.5)
+
+    results = [await coordinator._send_command(FAN_ID, CMD_QUERY_CODE) for _ in range(20)]
+
+    assert sum(result is not None for result in results) >= 15
+    # 모든 시도가 버려진 명령은 마지막 시도 뒤에 재전송하지 않음
+    metrics = coordinator.metrics
+    assert metrics.retries == simulator.stats["dropped"] - metrics.command_failures
+    # 재시도마다 다른 시퀀스 코드로 보냄
+    assert len(simulator.seq_counts) > 1
+
+
+async def test_corrupted_frames_are_counted(start):
+    simulator, coordinator = await start(corrupt_rate=0.3, broadcast_interval=0.01)
+
+    await asyncio.sleep(1)
+    # 보내는 중인 손상 패킷까지 받은 뒤 비교
+    simulator.corrupt_rate = 0
+    await asyncio.sleep(0.1)
+
+    assert simulator.stats["corrupted"] > 0
+    assert coordinator.metrics_stats["checksum_failures"] == simulator.stats["corrupted"]
+
+
+async def test_reconnects_after_disconnect(start):
+    simulator, coordinator = await start()
+    assert await coordinator._send_command(FAN_ID, CMD_QUERY_CODE) is not None
+
+    await simulator.async_disconnect_clients()
+    await asyncio.sleep(0.5)
+
+    assert coordinator.metrics.reconnects == 1
+    assert simulator.stats["connections"] == 2
+    assert await coordinator._send_command(FAN_ID, CMD_QUERY_CODE) is not None
+
+
+async def test_wallpad_poll_answers_do_not_acknowledge_commands(start):
+    simulator, coordinator = await start(drop_rate=1.0, poll_interval=0.1)
+    fan = simulator.devices[FAN_ID]
+    before = fan.value
+
+    results = [
+        await coordinator.async_send_command("fan", "livingroom", "preset", preset)
+        for preset in ("High", "Low")
+    ]
+
+    # 기기가 명령을 모두 버렸으므로 월패드 조회 응답을 ACK로 받아들이면 안 됨
+    assert simulator.stats["polls"] > 0
+    assert results == [False, False]
+    assert fan.value == before
+    assert coordinator.data.get("fan", {}).get("preset") != "High"
+
+
+async def test_state_command_acknowledged_with_poll_traffic(start):
+    simulator, coordinator = await start(poll_interval=0.3)
+
+    await asyncio.sleep(0.4)
+    assert await coordinator.async_send_command("fan", "livingroom", "preset", "High")
+
+    assert simulator.devices[FAN_ID].value == bytes.fromhex("1100c00000000000")
+    assert coordinator.data["fan"]["preset"] == "High"
+
+
+async def test_query_answered_from_recent_device_reply(start):
+    simulator, coordinator = await start()
+    assert await coordinator._query_device(FAN_ID) is not None
+    sent = simulator.stats["received"]
+
+    # 방금 받은 기기 응답으로 답하고 버스에는 다시 조회하지 않음
+    assert await coordinator._query_device(FAN_ID) is not None
+    assert simulator.stats["received"] == sent
@@ -0,0 +1,114 @@
+"""Tests for RS485 packet framing."""
+import pytest
+
+from custom_components.kocom_wallpad.const import PACKET_SIZE
+from custom_components.kocom_wallpad.protocol import (
+    CMD_STATE_CODE,
+    CODE_LIGHT,
+    CODE_THERMO,
+    TYPE_ACK_CODE,
+    WALLPAD_ID,
+    KocomFrame,
+    PacketDecoder,
+    build_packet,
+    validate_packet,
+)
+
+THERMO_ID = CODE_THERMO << 8 | 0x01
+LIGHT_ID = CODE_LIGHT << 8
+
+
+def _packets(count):
+    return [
+        build_packet(
+            0xC + i % 4, THERMO_ID if i % 2 else LIGHT_ID, WALLPAD_ID,
+            CMD_STATE_CODE, bytes((0x11, 0, 20 + i, 0, 22, 0, 0, 0)), TYPE_ACK_CODE,
+        )
+        for i in range(count)
+    ]
+
+
+def test_build_packet_fields():
+    value = bytes.fromhex("1100180016000000")
+    packet = build_packet(0xD, THERMO_ID, WALLPAD_ID, CMD_STATE_CODE, value, TYPE_ACK_CODE)
+
+    frame = KocomFrame.from_packet(packet)
+
+    assert validate_packet(packet)
+    assert frame.is_ack
+    assert frame.seq == 0xD
+    assert frame.dest == THERMO_ID
+    assert frame.src == WALLPAD_ID
+    assert frame.cmd == CMD_STATE_CODE
+    assert frame.value == value
+
+
+@pytest.mark.parametrize("split", range(1, 2 * PACKET_SIZE))
+def test_decoder_split_chunks(split):
+    packets = _packets(2)
+    stream = b"".join(packets)
+    decoder = PacketDecoder()
+
+    decoded = decoder.feed(stream[:split]) + decoder.feed(stream[split:])
+
+    assert decoded == packets
+    assert decoder.packets == 2
+    assert decoder.dropped_bytes == 0
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64])
+def test_decoder_byte_stream(size):
+    packets = _packets(10)
+    stream = b"".join(packets)
+    decoder = PacketDecoder()
+
+    decoded = []
+    for i in range(0, len(stream), size):
+        decoded += decoder.feed(stream[i:i + size])
+
+    assert decoded == packets
+
+
+def test_decoder_resyncs_after_garbage():
+    packets = _packets(2)
+    decoder = PacketDecoder()
+
+    decoded = decoder.feed(b"\x00\xaa\x01" + packets[0] + b"\x0d\x0d\xaa" + packets[1])
+
+    assert decoded == packets
+    assert decoder.dropped_bytes == 6
+    assert decoder.checksum_errors == 0
+
+
+def test_decoder_resyncs_after_corrupted_packet():
+    first, second = _packets(2)
+    corrupted = bytearray(first)
+    corrupted[12] ^= 0xFF
+    decoder = PacketDecoder()
+
+    decoded = decoder.feed(bytes(corrupted) + second)
+
+    assert decoded == [second]
+    assert decoder.checksum_errors == 1
+    assert decoder.dropped_bytes == PACKET_SIZE
+
+
+def test_decoder_finds_packet_inside_truncated_one():
+    first, second = _packets(2)
+    decoder = PacketDecoder()
+
+    # 앞 패킷이 잘리고 바로 다음 패킷이 이어진 경우
+    decoded = decoder.feed(first[:10] + second)
+
+    assert decoded == [second]
+    assert decoder.checksum_errors == 1
+
+
+def test_decoder_reset_discards_partial_packet():
+    first, second = _packets(2)
+    decoder = PacketDecoder()
+    decoder.feed(first[:10])
+
+    decoder.reset()
+
+    assert decoder.feed(second) == [second]
@@ -0,0 +1,120 @@
+"""Tests for the bus rhythm learner and the ACK round-trip estimator."""
+import pytest
+
+from custom_components.kocom_wallpad.const import (
+    BUS_BURST_GAP,
+    BUS_MAX_BURST_LENGTH,
+    BUS_RHYTHM_MIN_SAMPLES,
+)
+from custom_components.kocom_wallpad.timing import BusRhythm, RttEstimator
+
+
+def _bursts(rhythm: BusRhythm, starts, length: float = 0.05) -> None:
+    """Feed two-frame polling bursts starting at the given times."""
+    for start in starts:
+        rhythm.observe(start)
+        rhythm.observe(start + length)
+
+
+def test_rhythm_learns_regular_period():
+    rhythm = BusRhythm()
+
+    _bursts(rhythm, range(1, BUS_RHYTHM_MIN_SAMPLES + 1))
+    assert not rhythm.confident
+
+    _bursts(rhythm, [BUS_RHYTHM_MIN_SAMPLES + 1])
+    assert rhythm.confident
+    assert rhythm.period == pytest.approx(1.0)
+    assert rhythm.burst_length == pytest.approx(0.05)
+
+
+def test_rhythm_ignores_own_traffic():
+    rhythm = BusRhythm()
+    _bursts(rhythm, [1, 2, 3, 4])
+
+    # 우리 명령에 대한 응답은 버스트로 세지 않음
+    rhythm.observe(4.5, own=True)
+    _bursts(rhythm, [5])
+
+    assert rhythm.samples == 4
+    assert rhythm.period == pytest.approx(1.0)
+    assert rhythm.period_jitter == pytest.approx(0.0)
+
+
+def test_rhythm_divides_missed_bursts():
+    rhythm = BusRhythm()
+    _bursts(rhythm, [1, 2, 3, 4])
+
+    # 5초의 버스트를 놓쳐 간격이 주기의 두 배
+    _bursts(rhythm, [6, 7])
+
+    assert rhythm.samples == 5
+    assert rhythm.period == pytest.approx(1.0)
+    assert rhythm.confident
+
+
+def test_transmit_delayed_past_predicted_burst():
+    rhythm = BusRhythm()
+    _bursts(rhythm, [1, 2, 3, 4])
+
+    # 다음 버스트(5초) 직전에는 버스트가 끝날 때까지 미룸
+    now = 4.9
+    delay = rhythm.transmit_delay(now, 0.0, 0.1, 0.0)
+    assert now + delay > 5.05
+
+    # 유휴 구간 한가운데서는 바로 송신
+    assert rhythm.transmit_delay(4.5, 0.0, 0.1, 0.0) == 0.0
+
+
+def test_transmit_waits_for_running_burst():
+    rhythm = BusRhythm()
+    rhythm.observe(1.0)
+    rhythm.observe(1.05)
+
+    delay = rhythm.transmit_delay(1.06, 0.0, 0.1, 0.0)
+
+    assert delay == pytest.approx(1.05 + BUS_BURST_GAP - 1.06)
+
+
+def test_transmit_does_not_wait_for_continuous_traffic():
+    rhythm = BusRhythm()
+    now = 1.0
+    # 버스트 간격보다 짧게 계속 이어지는 트래픽
+    while now < 1.0 + BUS_MAX_BURST_LENGTH + 0.5:
+        rhythm.observe(now)
+        now += BUS_BURST_GAP / 2
+
+    assert rhythm.transmit_delay(rhythm.last_rx, 0.0, 0.1, 0.0) == 0.0
+
+
+def test_timeout_without_samples_uses_default():
+    estimator = RttEstimator()
+
+    assert estimator.timeout(1, 0.5) == 0.5
+    assert estimator.timeout(2, 0.5) == 1.0
+
+
+def test_timed_out_backs_off_without_changing_estimate():
+    estimator = RttEstimator()
+    for _ in range(5):
+        estimator.update(0.04)
+    srtt, first = estimator.srtt, estimator.timeout(1, 0.5)
+
+    estimator.timed_out()
+    estimator.timed_out()
+
+    assert estimator.srtt == srtt
+    assert estimator.timeout(1, 0.5) == pytest.approx(first * 4)
+    assert estimator.as_dict() == {"srtt": srtt, "rttvar": estimator.rttvar, "samples": 5}
+
+
+def test_backoff_resets_on_next_sample():
+    estimator = RttEstimator(srtt=0.04, rttvar=0.005, samples=5)
+    first = estimator.timeout(1, 0.5)
+    for _ in range(10):
+        estimator.timed_out()
+    assert estimator.timeout(1, 0.5) > first
+
+    estimator.update(0.04)
+
+    assert estimator.timeout(1, 0.5) == pytest.approx(first, abs=0.01)
@@ -0,0 +1 @@
+"""Development tools for Kocom Wallpad integration (simulator, capture replay, benchmarks)."""
@@ -0,0 +1,379 @@
+"""Benchmarks for the Kocom Wallpad packet and command paths.
+
+Usage:
+    python -m tools.benchmark [--output results.json]
+
+Runs the coordinator against a minimal stand-in for hass and a local
+WallpadSimulator, and prints (or writes) the timings as JSON so results
+can be compared between releases.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+from typing import Any
+
+from homeassistant.core import CoreState
+
+from custom_components.kocom_wallpad.const import (
+    HEADER,
+    TRAILER,
+    PACKET_SIZE,
+    CHKSUM_POSITION,
+    CONF_SOCKET_SERVER,
+    CONF_SOCKET_PORT,
+    CONF_LIGHT_COUNT,
+    CONF_ENABLED_DEVICES,
+    CONF_COMMAND_DEBOUNCE,
+)
+from custom_components.kocom_wallpad.coordinator import KocomCoordinator
+from custom_components.kocom_wallpad.protocol import (
+    TYPE_ACK_CODE,
+    WALLPAD_ID,
+    CODE_LIGHT,
+    CODE_THERMO,
+    CMD_STATE_CODE,
+    PacketDecoder,
+    build_packet,
+)
+from .simulator import WallpadSimulator
+
+ENABLED_DEVICES = [
+    "light", "gas", "fan", "elevator", "thermo_livingroom", "thermo_bedroom"
+]
+
+
+class BenchmarkHass:
+    """Just enough of HomeAssistant for the coordinator."""
+
+    def __init__(self, config_dir: str) -> None:
+        """Initialize."""
+        self.data: dict[str, Any] = {}
+        self.loop = asyncio.get_running_loop()
+        self.config = SimpleNamespace(path=lambda *parts: os.path.join(config_dir, *parts))
+        # Store(상태 스냅샷 저장)가 확인하는 실행 상태와 종료 이벤트 등록
+        self.state = CoreState.running
+        self.bus = SimpleNamespace(async_listen_once=lambda event_type, listener: lambda: None)
+
+    def async_create_task(self, target: Awaitable, name: str | None = None, **kwargs: Any) -> asyncio.Task:
+        """Create a task."""
+        return self.loop.create_task(target, name=name)
+
+    def async_create_background_task(self, target: Awaitable, name: str | None = None, **kwargs: Any) -> asyncio.Task:
+        """Create a background task."""
+        return self.loop.create_task(target, name=name)
+
+    async def async_add_executor_job(self, target: Callable, *args: Any) -> Any:
+        """Run a function in the executor."""
+        return await self.loop.run_in_executor(None, target, *args)
+
+
+def create_coordinator(hass: BenchmarkHass, port: int, **config: Any) -> KocomCoordinator:
+    """Create a coordinator for a local socket server."""
+    data = {
+        CONF_SOCKET_SERVER: "127.0.0.1",
+        CONF_SOCKET_PORT: port,
+        CONF_LIGHT_COUNT: 3,
+        CONF_ENABLED_DEVICES: ENABLED_DEVICES,
+        **config,
+    }
+    entry = SimpleNamespace(data=data, entry_id="benchmark")
+    return KocomCoordinator(hass, entry)
+
+
+def state_packet(device_id: int, value: bytes) -> bytes:
+    """Build a wallpad state frame for a device."""
+    return build_packet(0xC, device_id, WALLPAD_ID, CMD_STATE_CODE, value, TYPE_ACK_CODE)
+
+
+def _result(samples: list[float], operations: int) -> dict[str, Any]:
+    """Summarize per-round timings, each covering operations / len(samples) operations."""
+    samples.sort()
+    per_round = operations / len(samples)
+    total = sum(samples)
+    return {
+        "operations": operations,
+        "total": total,
+        "mean": total / operations,
+        "p50": samples[len(samples) // 2] / per_round,
+        "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))] / per_round,
+        "max": samples[-1] / per_round,
+        "ops_per_sec": operations / total if total else 0.0,
+    }
+
+
+async def _measure(
+    func: Callable[[], Awaitable[Any]], rounds: int, per_round: int = 1
+) -> dict[str, Any]:
+    """Time rounds of an async function that performs per_round operations."""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+    return _result(samples, rounds * per_round)
+
+
+async def bench_decode(coordinator: KocomCoordinator, rounds: int) -> dict[str, Any]:
+    """Validate and parse state frames."""
+    packets = [
+        state_packet(CODE_THERMO << 8, bytes((0x11, 0, 20 + i % 5, 0, 22, 0, 0, 0)))
+        for i in range(100)
+    ]
+
+    async def run() -> None:
+        for packet in packets:
+            if coordinator._validate_packet(packet):
+                coordinator._parse_packet(packet)
+
+    return await _measure(run, rounds, len(packets))
+
+
+def legacy_hex_decode(chunks: list[bytes]) -> int:
+    """Split chunks into packets the way the hex string read loop used to."""
+    frames = 0
+    buf = ""
+    for data in chunks:
+        buf += data.hex()
+        while len(buf) >= 4:
+            header_idx = buf.find(HEADER)
+            if header_idx == -1:
+                buf = buf[-2:]
+                break
+            if header_idx > 0:
+                buf = buf[header_idx:]
+            if len(buf) < PACKET_SIZE * 2:
+                break
+            packet = buf[:PACKET_SIZE * 2]
+            chksum = f"{sum(bytes.fromhex(packet[len(HEADER):CHKSUM_POSITION * 2])) % 256:02x}"
+            if (
+                chksum == packet[CHKSUM_POSITION * 2:CHKSUM_POSITION * 2 + 2]
+                and packet[-len(TRAILER):] == TRAILER
+            ):
+                frames += 1
+            buf = buf[PACKET_SIZE * 2:]
+    return frames
+
+
+def bench_decoder_throughput(
+    frames: int = 100_000, chunk_sizes: tuple[int, ...] = (64, 1024, 65536)
+) -> dict[str, Any]:
+    """Compare frames/sec of the legacy hex loop and PacketDecoder."""
+    stream = b"".join(
+        state_packet(CODE_LIGHT << 8, bytes((0xFF * (i % 2), 0, 0, 0, 0, 0, 0, 0)))
+        for i in range(frames)
+    )
+
+    def run_decoder(chunks: list[bytes]) -> int:
+        decoder = PacketDecoder()
+        return sum(len(decoder.feed(chunk)) for chunk in chunks)
+
+    results = {}
+    for size in chunk_sizes:
+        chunks = [stream[i:i + size] for i in range(0, len(stream), size)]
+        result = {}
+        for name, decode in (("legacy_hex", legacy_hex_decode), ("decoder", run_decoder)):
+            start = time.perf_counter()
+            decoded = decode(chunks)
+            elapsed = time.perf_counter() - start
+            assert decoded == frames, (name, decoded)
+            result[name] = frames / elapsed
+        result["speedup"] = result["decoder"] / result["legacy_hex"]
+        results[f"chunk_{size}"] = result
+    results["frames"] = frames
+    return results
+
+
+async def bench_stream_decode(coordinator: KocomCoordinator, rounds: int) -> dict[str, Any]:
+    """Split a received byte stream into packets."""
+    packets = [
+        state_packet(CODE_LIGHT << 8, bytes((0xFF * (i % 2), 0, 0, 0, 0, 0, 0, 0)))
+        for i in range(100)
+    ]
+    stream = b"".join(packets)
+    # 소켓에서 읽히는 것처럼 패킷 경계와 무관하게 나눔
+    chunks = [stream[i:i + 64] for i in range(0, len(stream), 64)]
+
+    async def run() -> None:
+        for chunk in chunks:
+            coordinator.decoder.feed(chunk)
+
+    return await _measure(run, rounds, len(packets))
+
+
+async def bench_state_update(
+    coordinator: KocomCoordinator, rounds: int, listeners: int
+) -> dict[str, Any]:
+    """Apply changing state frames and notify entity listeners."""
+    notified = 0
+
+    def listener() -> None:
+        nonlocal notified
+        notified += 1
+
+    removers = [
+        coordinator.async_add_device_listener("light", listener, {f"light_{i % 3 + 1}"})
+        for i in range(listeners)
+    ]
+    frames = [
+        coordinator._parse_packet(
+            state_packet(CODE_LIGHT << 8, bytes((0xFF * (i % 2), 0, 0, 0, 0, 0, 0, 0)))
+        )
+        for i in range(100)
+    ]
+
+    async def run() -> None:
+        for frame in frames:
+            await coordinator._update_state_from_packet(frame)
+
+    result = await _measure(run, rounds, len(frames))
+    for remove in removers:
+        remove()
+    result["listeners"] = listeners
+    result["notified"] = notified
+    return result
+
+
+async def bench_burst(
+    coordinator: KocomCoordinator, rounds: int, listeners: int
+) -> dict[str, Any]:
+    """Handle received chunks holding a burst of state frames for the same devices."""
+    notified = 0
+
+    def listener() -> None:
+        nonlocal notified
+        notified += 1
+
+    removers = [
+        coordinator.async_add_device_listener(device_key, listener)
+        for device_key in ("light", "thermo_livingroom", "thermo_bedroom")
+        for _ in range(listeners)
+    ]
+    # 월패드가 상태를 연달아 보고하는 경우: 한 덩어리에 같은 기기의 패킷이 여러 개
+    chunks = [
+        b"".join(
+            state_packet(device_id, bytes((0x11, 0, 20 + (i + j) % 5, 0, 22, 0, 0, 0)))
+            for j in range(4)
+            for device_id in (CODE_LIGHT << 8, CODE_THERMO << 8, CODE_THERMO << 8 | 1)
+        )
+        for i in range(10)
+    ]
+
+    async def run() -> None:
+        for chunk in chunks:
+            await coordinator._handle_received(chunk)
+
+    result = await _measure(run, rounds, len(chunks))
+    for remove in removers:
+        remove()
+    result["frames_per_chunk"] = 12
+    result["listeners"] = listeners * 3
+    result["notified"] = notified
+    return result
+
+
+async def bench_query_cache_hit(coordinator: KocomCoordinator, rounds: int) -> dict[str, Any]:
+    """Answer device queries from recently received frames."""
+    device_id = CODE_THERMO << 8
+    await coordinator._process_packet(
+        state_packet(device_id, bytes((0x11, 0, 22, 0, 21, 0, 0, 0)))
+    )
+
+    async def run() -> None:
+        for _ in range(100):
+            # 캐시를 놓치면 실제 조회를 보내므로 결과가 없으면 벤치마크를 중단
+            if await coordinator._query_device(device_id) is None:
+                raise RuntimeError("query was not answered from the frame cache")
+
+    return await _measure(run, rounds, 100)
+
+
+async def bench_command_round_trip(
+    coordinator: KocomCoordinator, rounds: int
+) -> dict[str, Any]:
+    """Send commands and wait for the simulated device to acknowledge them."""
+    # 매번 값이 바뀌도록 두 풍량을 번갈아 보냄
+    presets = itertools.cycle(("Low", "High"))
+    failures = 0
+
+    async def run() -> None:
+        nonlocal failures
+        if not await coordinator.async_send_command(
+            "fan", "livingroom", "set_preset", next(presets)
+        ):
+            failures += 1
+
+    result = await _measure(run, rounds)
+    result["failures"] = failures
+    return result
+
+
+async def async_run_benchmarks(
+    rounds: int = 50, listeners: int = 10, ack_delay: float = 0.0,
+    baud_rate: int | None = None,
+) -> dict[str, Any]:
+    """Run all benchmarks and return the results."""
+    simulator = WallpadSimulator(ack_delay=ack_delay, baud_rate=baud_rate)
+    await simulator.async_start(port=0)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = BenchmarkHass(config_dir)
+        coordinator = create_coordinator(hass, simulator.port, **{CONF_COMMAND_DEBOUNCE: 0})
+        try:
+            benchmarks = {
+                "decode": await bench_decode(coordinator, rounds),
+                "stream_decode": await bench_stream_decode(coordinator, rounds),
+                "decoder_throughput": bench_decoder_throughput(),
+                "state_update": await bench_state_update(coordinator, rounds, listeners),
+                "burst": await bench_burst(coordinator, rounds, listeners),
+                "query_cache_hit": await bench_query_cache_hit(coordinator, rounds),
+            }
+            await coordinator._connect()
+            benchmarks["command_round_trip"] = await bench_command_round_trip(
+                coordinator, rounds
+            )
+        finally:
+            await coordinator.async_shutdown()
+            await simulator.async_stop()
+
+    return {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "rounds": rounds,
+        "ack_delay": ack_delay,
+        "baud_rate": baud_rate,
+        "benchmarks": benchmarks,
+    }
+
+
+def main() -> None:
+    """Parse arguments and run."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--listeners", type=int, default=10, help="entity listeners for the light")
+    parser.add_argument("--ack-delay", type=float, default=0.0, help="simulated device delay")
+    parser.add_argument("--baud-rate", type=int, default=0, help="simulated bus rate, 0 for unlimited")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_run_benchmarks(
+        args.rounds, args.listeners, args.ack_delay, args.baud_rate or None
+    ))
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
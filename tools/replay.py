@@ -0,0 +1,224 @@
+"""Replay recorded bus captures for Kocom Wallpad integration.
+
+Usage:
+    python -m tools.replay capture.cap [capture.cap.1 ...]
+    python -m tools.replay capture.cap --serve --realtime
+
+Without --serve the capture is fed straight into the packet decoder and
+throughput/memory statistics are printed as JSON. With --serve a TCP
+server stands in for the RS485 socket server, so a coordinator pointed
+at it receives the recorded traffic.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+import tracemalloc
+from collections.abc import AsyncIterator
+from typing import Any
+
+from custom_components.kocom_wallpad.capture import (
+    CAPTURE_RX_CHUNK,
+    CAPTURE_RX_FRAME,
+    read_capture,
+)
+from custom_components.kocom_wallpad.const import DEFAULT_SOCKET_PORT
+from custom_components.kocom_wallpad.protocol import PacketDecoder
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def load_records(paths: list[str]) -> list[tuple[float, bytes]]:
+    """Load received data records from capture files, ordered by time."""
+    records = [
+        (timestamp, data)
+        for path in paths
+        for timestamp, kind, data in read_capture(path)
+        if kind in (CAPTURE_RX_CHUNK, CAPTURE_RX_FRAME)
+    ]
+    records.sort(key=lambda record: record[0])
+    return records
+
+
+async def iter_records(
+    records: list[tuple[float, bytes]], realtime: bool = False, speed: float = 1.0
+) -> AsyncIterator[tuple[float, bytes]]:
+    """Yield (scheduled time, data), optionally keeping the recorded timing."""
+    if not records:
+        return
+    start = time.perf_counter()
+    first = records[0][0]
+    for timestamp, data in records:
+        scheduled = start + (timestamp - first) / speed if realtime else time.perf_counter()
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield scheduled, data
+
+
+def _summary(
+    latencies: list[float], frames: int, size: int, chunks: int, elapsed: float
+) -> dict[str, Any]:
+    """Build replay statistics."""
+    latencies.sort()
+
+    def percentile(ratio: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * ratio))] if latencies else 0.0
+
+    return {
+        "chunks": chunks,
+        "bytes": size,
+        "frames": frames,
+        "elapsed": elapsed,
+        "frames_per_sec": frames / elapsed if elapsed else 0.0,
+        "latency_p50": percentile(0.50),
+        "latency_p95": percentile(0.95),
+        "latency_max": latencies[-1] if latencies else 0.0,
+    }
+
+
+async def replay_into_decoder(
+    records: list[tuple[float, bytes]], realtime: bool = False, speed: float = 1.0
+) -> dict[str, Any]:
+    """Feed a capture into a packet decoder and measure it."""
+    decoder = PacketDecoder()
+    latencies = []
+    frames = size = chunks = 0
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    async for scheduled, data in iter_records(records, realtime, speed):
+        frames += len(decoder.feed(data))
+        latencies.append(time.perf_counter() - scheduled)
+        size += len(data)
+        chunks += 1
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = _summary(latencies, frames, size, chunks, elapsed)
+    stats["peak_memory"] = peak
+    return stats
+
+
+async def replay_into_coordinator(
+    coordinator: Any, records: list[tuple[float, bytes]],
+    realtime: bool = False, speed: float = 1.0,
+) -> dict[str, Any]:
+    """Feed a capture through a coordinator's receive path and measure it."""
+    latencies = []
+    packets_before = coordinator.decoder.packets
+    size = chunks = 0
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    async for scheduled, data in iter_records(records, realtime, speed):
+        await coordinator._handle_received(data)
+        # 예정 수신 시각부터 상태 반영이 끝날 때까지의 지연
+        latencies.append(time.perf_counter() - scheduled)
+        size += len(data)
+        chunks += 1
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    frames = coordinator.decoder.packets - packets_before
+    stats = _summary(latencies, frames, size, chunks, elapsed)
+    stats["peak_memory"] = peak
+    return stats
+
+
+class ReplayServer:
+    """TCP stand-in for the RS485 socket server that plays back a capture."""
+
+    def __init__(
+        self,
+        records: list[tuple[float, bytes]],
+        realtime: bool = False,
+        speed: float = 1.0,
+        loop: bool = False,
+    ) -> None:
+        """Initialize."""
+        self.records = records
+        self.realtime = realtime
+        self.speed = speed
+        self.loop = loop
+        self.received = bytearray()
+        self.server: asyncio.Server | None = None
+
+    @property
+    def port(self) -> int:
+        """Return the listening port."""
+        return self.server.sockets[0].getsockname()[1]
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = DEFAULT_SOCKET_PORT) -> None:
+        """Start listening."""
+        self.server = await asyncio.start_server(self._handle_client, host, port)
+
+    async def async_stop(self) -> None:
+        """Stop listening."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Play the capture to a connected client."""
+        _LOGGER.info("Replay client connected")
+        drain_task = asyncio.create_task(self._drain_client(reader))
+        try:
+            while True:
+                async for _, data in iter_records(self.records, self.realtime, self.speed):
+                    writer.write(data)
+                    await writer.drain()
+                if not self.loop:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            drain_task.cancel()
+            writer.close()
+
+    async def _drain_client(self, reader: asyncio.StreamReader) -> None:
+        """Keep what the client sends, so commands can be inspected."""
+        while data := await reader.read(1024):
+            self.received += data
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Run the replay tool."""
+    records = load_records(args.captures)
+    if not args.serve:
+        stats = await replay_into_decoder(records, args.realtime, args.speed)
+        print(json.dumps(stats, indent=2))
+        return
+
+    server = ReplayServer(records, args.realtime, args.speed, args.loop)
+    await server.async_start(args.host, args.port)
+    print(f"Replaying {len(records)} records on {args.host}:{server.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.async_stop()
+
+
+def main() -> None:
+    """Parse arguments and run."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("captures", nargs="+", help="capture files, oldest first")
+    parser.add_argument("--serve", action="store_true", help="serve over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_SOCKET_PORT)
+    parser.add_argument("--realtime", action="store_true", help="keep recorded timing")
+    parser.add_argument("--speed", type=float, default=1.0, help="realtime speed factor")
+    parser.add_argument("--loop", action="store_true", help="repeat the capture")
+    asyncio.run(_async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""Simulated RS485 socket server for Kocom Wallpad integration.
+
+Usage:
+    python -m tools.simulator --rooms 8 --drop-rate 0.1
+
+The simulator stands in for the EW11-style socket server the coordinator
+connects to. Virtual light, thermostat, fan, gas and elevator devices
+answer query and state commands after a configurable delay, some frames
+can be dropped or sent with a broken checksum, and the wallpad can be
+made to broadcast background state traffic or poll every device in
+regular bursts. All output is paced at the configured bus rate, as on
+the real half-duplex bus, and with collisions enabled a command that
+arrives while the bus is busy is lost.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+from collections import Counter
+from typing import Any
+
+from custom_components.kocom_wallpad.const import (
+    DEFAULT_SOCKET_PORT,
+    PACKET_SIZE,
+    CHKSUM_POSITION,
+)
+from custom_components.kocom_wallpad.protocol import (
+    TYPE_ACK_CODE,
+    VALUE_SIZE,
+    WALLPAD_ID,
+    CODE_LIGHT,
+    CODE_GAS,
+    CODE_THERMO,
+    CODE_ELEVATOR,
+    CODE_FAN,
+    CMD_STATE_CODE,
+    CMD_QUERY_CODE,
+    KocomFrame,
+    PacketDecoder,
+    build_packet,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# 9600bps, 8N1 기준 한 바이트는 10비트
+DEFAULT_BAUD_RATE = 9600
+BITS_PER_BYTE = 10
+
+# 기기별 초기 값
+INITIAL_VALUES = {
+    CODE_LIGHT: bytes(VALUE_SIZE),
+    CODE_GAS: bytes.fromhex("0100000000000000"),
+    CODE_THERMO: bytes.fromhex("1100140016000000"),
+    CODE_ELEVATOR: bytes(VALUE_SIZE),
+    CODE_FAN: bytes.fromhex("1100800000000000"),
+}
+
+# 난방 현재 온도 위치
+THERMO_CUR_TEMP_POSITION = 4
+
+
+class VirtualDevice:
+    """A device on the simulated bus holding its 8 byte value."""
+
+    __slots__ = ("device_id", "value")
+
+    def __init__(self, device_id: int) -> None:
+        """Initialize."""
+        self.device_id = device_id
+        self.value = INITIAL_VALUES.get(device_id >> 8, bytes(VALUE_SIZE))
+
+    def apply(self, value: bytes) -> bool:
+        """Apply a state command and return true if the value changed."""
+        if self.device_id >> 8 == CODE_THERMO:
+            # 현재 온도는 명령으로 바뀌지 않음
+            value = (
+                value[:THERMO_CUR_TEMP_POSITION]
+                + self.value[THERMO_CUR_TEMP_POSITION:THERMO_CUR_TEMP_POSITION + 1]
+                + value[THERMO_CUR_TEMP_POSITION + 1:]
+            )
+        changed = value != self.value
+        self.value = value
+        return changed
+
+    def drift(self, rng: random.Random) -> None:
+        """Change the value the way a device does on its own."""
+        code = self.device_id >> 8
+        value = bytearray(self.value)
+        if code == CODE_THERMO:
+            value[THERMO_CUR_TEMP_POSITION] = max(
+                5, min(40, value[THERMO_CUR_TEMP_POSITION] + rng.choice((-1, 1)))
+            )
+        elif code == CODE_ELEVATOR:
+            value[0] = rng.randint(1, 20)
+        elif code == CODE_LIGHT:
+            index = rng.randrange(VALUE_SIZE)
+            value[index] ^= 0xFF
+        self.value = bytes(value)
+
+
+class WallpadSimulator:
+    """TCP server simulating a wallpad and its devices on an RS485 bus."""
+
+    def __init__(
+        self,
+        rooms: int = 2,
+        ack_delay: float = 0.02,
+        ack_jitter: float = 0.0,
+        ack_delays: dict[int, float] | None = None,
+        drop_rate: float = 0.0,
+        corrupt_rate: float = 0.0,
+        broadcast_interval: float = 0.0,
+        drift_rate: float = 0.0,
+        poll_interval: float = 0.0,
+        collisions: bool = False,
+        baud_rate: int | None = DEFAULT_BAUD_RATE,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize."""
+        self.ack_delay = ack_delay
+        self.ack_jitter = ack_jitter
+        # device code -> 기기 종류별 응답 지연 (없으면 ack_delay)
+        self.ack_delays = ack_delays or {}
+        self.drop_rate = drop_rate
+        self.corrupt_rate = corrupt_rate
+        self.broadcast_interval = broadcast_interval
+        self.drift_rate = drift_rate
+        self.poll_interval = poll_interval
+        self.collisions = collisions
+        self.baud_rate = baud_rate
+        self.rng = random.Random(seed)
+
+        self.devices: dict[int, VirtualDevice] = {}
+        for room in range(rooms):
+            for code in (CODE_LIGHT, CODE_THERMO):
+                self._add_device(code << 8 | room)
+        for code in (CODE_FAN, CODE_GAS, CODE_ELEVATOR):
+            self._add_device(code << 8)
+
+        self.stats: Counter[str] = Counter()
+        self.seq_counts: Counter[int] = Counter()
+        self.server: asyncio.Server | None = None
+        self.writers: set[asyncio.StreamWriter] = set()
+        self._bus_lock = asyncio.Lock()
+        self._busy_until = 0.0
+        self._tasks: set[asyncio.Task] = set()
+        self._clients: set[asyncio.Task] = set()
+
+    def _add_device(self, device_id: int) -> None:
+        """Add a virtual device."""
+        self.devices[device_id] = VirtualDevice(device_id)
+
+    @property
+    def port(self) -> int:
+        """Return the listening port."""
+        return self.server.sockets[0].getsockname()[1]
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = DEFAULT_SOCKET_PORT) -> None:
+        """Start listening and broadcasting."""
+        self.server = await asyncio.start_server(self._handle_client, host, port)
+        if self.broadcast_interval > 0:
+            self._spawn(self._broadcast_loop())
+        if self.poll_interval > 0:
+            self._spawn(self._poll_loop())
+
+    async def async_stop(self) -> None:
+        """Stop the server and background traffic."""
+        for task in list(self._tasks):
+            task.cancel()
+        await self.async_disconnect_clients()
+        if self._clients:
+            # 연결 처리 태스크가 스스로 끝나도록 기다림
+            await asyncio.wait(self._clients, timeout=1)
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def async_disconnect_clients(self) -> None:
+        """Drop all client connections, as a socket server restart would."""
+        for writer in list(self.writers):
+            writer.close()
+        self.writers.clear()
+        self.stats["disconnects"] += 1
+
+    def _spawn(self, coro: Any) -> None:
+        """Run a background task and keep a reference to it."""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Read packets from a client and answer them."""
+        _LOGGER.info("Simulator client connected")
+        self.writers.add(writer)
+        self._clients.add(asyncio.current_task())
+        self.stats["connections"] += 1
+        decoder = PacketDecoder()
+        try:
+            while data := await reader.read(1024):
+                for packet in decoder.feed(data):
+                    self._handle_packet(KocomFrame.from_packet(packet))
+        except ConnectionError:
+            pass
+        finally:
+            self.writers.discard(writer)
+            self._clients.discard(asyncio.current_task())
+            writer.close()
+
+    def _handle_packet(self, frame: KocomFrame) -> None:
+        """Schedule the device answer to a received packet."""
+        self.stats["received"] += 1
+        if frame.is_ack:
+            return
+        self.seq_counts[frame.seq] += 1
+
+        device = self.devices.get(frame.dest)
+        if device is None:
+            self.stats["unknown"] += 1
+            return
+        if self.collisions and asyncio.get_running_loop().time() < self._busy_until:
+            # 다른 패킷이 전송되는 중에 보낸 명령은 충돌로 깨짐
+            self.stats["collisions"] += 1
+            return
+        if self.rng.random() < self.drop_rate:
+            # 응답 없음 -> 코디네이터는 다음 시퀀스로 재전송
+            self.stats["dropped"] += 1
+            return
+        self._spawn(self._answer(frame, device))
+
+    async def _answer(self, frame: KocomFrame, device: VirtualDevice) -> None:
+        """Answer a command after the device delay."""
+        delay = self.ack_delays.get(device.device_id >> 8, self.ack_delay)
+        delay += self.rng.uniform(0, self.ack_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        changed = False
+        if frame.cmd == CMD_STATE_CODE:
+            changed = device.apply(frame.value)
+        elif frame.cmd != CMD_QUERY_CODE:
+            # 켜기/끄기 등 나머지 명령은 값 변경 없이 응답만 함
+            self.stats["other_commands"] += 1
+
+        await self._write(
+            build_packet(
+                frame.seq, frame.src, device.device_id, frame.cmd, device.value,
+                TYPE_ACK_CODE,
+            )
+        )
+        self.stats["acked"] += 1
+        if changed:
+            # 월패드가 바뀐 상태를 다시 알려줌
+            await self._write_state(device)
+
+    async def _write_state(self, device: VirtualDevice) -> None:
+        """Broadcast a wallpad state frame for a device."""
+        await self._write(
+            build_packet(
+                0xC, device.device_id, WALLPAD_ID, CMD_STATE_CODE, device.value,
+                TYPE_ACK_CODE,
+            )
+        )
+        self.stats["states"] += 1
+
+    async def _broadcast_loop(self) -> None:
+        """Send background state traffic for random devices."""
+        devices = list(self.devices.values())
+        while True:
+            await asyncio.sleep(self.broadcast_interval)
+            device = self.rng.choice(devices)
+            if self.rng.random() < self.drift_rate:
+                device.drift(self.rng)
+            await self._write_state(device)
+
+    async def _poll_loop(self) -> None:
+        """Poll every device in one burst, as the wallpad master does."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            for device in list(self.devices.values()):
+                await self._write(
+                    build_packet(0xC, device.device_id, WALLPAD_ID, CMD_QUERY_CODE, bytes(VALUE_SIZE))
+                )
+                # 기기도 월패드 조회에 같은 지연 후 응답
+                await asyncio.sleep(self.ack_delay)
+                await self._write(
+                    build_packet(
+                        0xC, WALLPAD_ID, device.device_id, CMD_QUERY_CODE, device.value,
+                        TYPE_ACK_CODE,
+                    )
+                )
+            self.stats["polls"] += 1
+
+    async def _write(self, packet: bytes) -> None:
+        """Write a packet to all clients at the bus rate."""
+        if self.rng.random() < self.corrupt_rate:
+            corrupt = bytearray(packet)
+            corrupt[CHKSUM_POSITION] ^= 0xFF
+            packet = bytes(corrupt)
+            self.stats["corrupted"] += 1
+
+        async with self._bus_lock:
+            # 버스는 한 번에 한 패킷만 보내므로 전송 시간만큼 점유
+            if self.baud_rate:
+                duration = PACKET_SIZE * BITS_PER_BYTE / self.baud_rate
+                self._busy_until = asyncio.get_running_loop().time() + duration
+                await asyncio.sleep(duration)
+            for writer in list(self.writers):
+                try:
+                    writer.write(packet)
+                except (ConnectionError, RuntimeError):
+                    self.writers.discard(writer)
+            self.stats["sent"] += 1
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Run the simulator."""
+    simulator = WallpadSimulator(
+        rooms=args.rooms,
+        ack_delay=args.ack_delay,
+        ack_jitter=args.ack_jitter,
+        drop_rate=args.drop_rate,
+        corrupt_rate=args.corrupt_rate,
+        broadcast_interval=args.broadcast_interval,
+        drift_rate=args.drift_rate,
+        poll_interval=args.poll_interval,
+        collisions=args.collisions,
+        baud_rate=args.baud_rate,
+        seed=args.seed,
+    )
+    await simulator.async_start(args.host, args.port)
+    print(f"Simulating {len(simulator.devices)} devices on {args.host}:{simulator.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.async_stop()
+
+
+def main() -> None:
+    """Parse arguments and run."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_SOCKET_PORT)
+    parser.add_argument("--rooms", type=int, default=2, help="rooms with light and thermostat")
+    parser.add_argument("--ack-delay", type=float, default=0.02, help="device answer delay")
+    parser.add_argument("--ack-jitter", type=float, default=0.0, help="extra random delay")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="unanswered command ratio")
+    parser.add_argument("--corrupt-rate", type=float, default=0.0, help="bad checksum ratio")
+    parser.add_argument("--broadcast-interval", type=float, default=0.0,
+                        help="seconds between background state frames, 0 to disable")
+    parser.add_argument("--drift-rate", type=float, default=0.0,
+                        help="ratio of background frames that carry a changed value")
+    parser.add_argument("--poll-interval", type=float, default=0.0,
+                        help="seconds between wallpad polling bursts, 0 to disable")
+    parser.add_argument("--collisions", action="store_true",
+                        help="lose commands sent while the bus is busy")
+    parser.add_argument("--baud-rate", type=int, default=DEFAULT_BAUD_RATE,
+                        help="bus rate, 0 for unlimited")
+    parser.add_argument("--seed", type=int, default=None)
+    asyncio.run(_async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()